@@ -1,6 +1,6 @@
 """File operation tools for MCP server."""
 
-from mcp_workspace.file_tools.directory_utils import list_files
+from mcp_workspace.file_tools.directory_utils import iter_files, list_files
 from mcp_workspace.file_tools.edit_file import edit_file
 from mcp_workspace.file_tools.file_operations import (
     append_file,
@@ -24,6 +24,7 @@
     "delete_file",
     "move_file",
     "list_files",
+    "iter_files",
     "edit_file",
     "search_files",
     "list_directory_tree",
@@ -1,20 +1,33 @@
 """Directory utilities for file operations.
 
 This module provides functions for file discovery and listing with gitignore support.
-We use the external igittigitt library for handling .gitignore patterns.
+We use the external pathspec library for handling .gitignore patterns.
 """
 
 import logging
 import os
+import stat
+import threading
 from pathlib import Path
-from typing import Callable, List, Optional, Tuple, Union
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from igittigitt import IgnoreParser
+from pathspec import GitIgnoreSpec
 
 from mcp_workspace.file_tools.path_utils import normalize_path
 
 logger = logging.getLogger(__name__)
 
+# gitignore path -> (st_mtime_ns, st_size, spec, matcher, content)
+_gitignore_cache: Dict[
+    str,
+    Tuple[int, int, Optional[GitIgnoreSpec], Optional[Callable[[str], bool]], str],
+] = {}
+_gitignore_cache_lock = threading.Lock()
+
+# Version-control metadata directories that are never walked, regardless of
+# gitignore settings; checked by name before any pattern matching
+_ALWAYS_SKIP_DIRS = frozenset({".git", ".hg", ".svn"})
+
 
 def is_path_in_git_dir(path: str) -> bool:
     """Check if a path is inside a .git directory."""
@@ -48,140 +61,349 @@ def is_path_gitignored(path: str, project_dir: Path) -> bool:
     return bool(matcher(abs_path))
 
 
-def _discover_files(directory: Path, project_dir: Path) -> List[str]:
-    """Discover all files recursively, excluding the .git directory."""
-    discovered_files = []
+def _scan_entries(
+    entries: Iterable["os.DirEntry[str]"],
+    rel_prefix: str,
+    matcher: Optional[Callable[[str], bool]],
+) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Split directory entries into kept files and subdirectories to walk.
 
-    for root, dirs, files in os.walk(directory):
-        # Skip .git directories
-        dirs[:] = [d for d in dirs if not is_path_in_git_dir(d)]
+    Args:
+        entries: Entries of one directory, as returned by ``os.scandir``
+        rel_prefix: Relative path prefix (ending in "/", or empty)
+        matcher: Optional gitignore matcher; ignored files are dropped and
+            ignored subdirectories are pruned
 
-        root_path = Path(root)
-        try:
-            rel_root = root_path.relative_to(project_dir)
-        except ValueError:
-            continue
+    Returns:
+        Tuple of (relative file paths, (absolute, relative prefix) per subdirectory)
+    """
+    files: List[str] = []
+    subdirs: List[Tuple[str, str]] = []
+    for entry in entries:
+        rel_entry = rel_prefix + entry.name
+        if entry.is_dir():
+            # Like os.walk, don't descend into symlinked directories
+            if entry.name in _ALWAYS_SKIP_DIRS or entry.is_symlink():
+                continue
+            # A trailing separator marks the path as a directory for the matcher
+            if matcher is not None and matcher(entry.path + os.sep):
+                continue
+            subdirs.append((entry.path, rel_entry + "/"))
+        elif matcher is None or not matcher(entry.path):
+            files.append(rel_entry)
+    return files, subdirs
+
+
+def _scan_directory(
+    abs_dir: str, rel_prefix: str, matcher: Optional[Callable[[str], bool]]
+) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Read one directory and split its entries into files and subdirectories."""
+    try:
+        with os.scandir(abs_dir) as entries:
+            return _scan_entries(entries, rel_prefix, matcher)
+    except OSError as e:
+        # os.walk silently skipped unreadable directories; keep that behavior
+        logger.debug("Skipping unreadable directory %s: %s", abs_dir, e)
+        return [], []
+
+
+def _iter_subtree(
+    abs_dir: str, rel_prefix: str, matcher: Optional[Callable[[str], bool]]
+) -> Iterator[str]:
+    """Yield all files below one directory with an iterative scandir walk."""
+    stack = [(abs_dir, rel_prefix)]
+    while stack:
+        current_dir, current_prefix = stack.pop()
+        dir_files, subdirs = _scan_directory(current_dir, current_prefix, matcher)
+        yield from dir_files
+        stack.extend(subdirs)
+
+
+def _gitignore_matcher_for_walk(
+    directory_str: str,
+    project_dir: Path,
+    rel_start: str,
+    entries: List["os.DirEntry[str]"],
+) -> Optional[Callable[[str], bool]]:
+    """Combine the .gitignore files that apply to a walk into one matcher.
+
+    Like git, rules from the project root and every directory down to the
+    walked one apply, with deeper files taking precedence. The walked
+    directory's own .gitignore is looked up in its already-read entries,
+    which avoids a separate existence check; ``DirEntry.stat()`` is served
+    from the listing on Windows.
+    """
+    specs: List[Tuple[str, GitIgnoreSpec]] = []
+
+    if rel_start:
+        # Project root and intermediate directories above the walked one
+        ancestor = str(project_dir)
+        ancestors = [ancestor]
+        for part in rel_start.split("/")[:-2]:
+            ancestor = os.path.join(ancestor, part)
+            ancestors.append(ancestor)
+        for ancestor in ancestors:
+            spec, _ = _read_gitignore_spec(Path(ancestor, ".gitignore"))
+            if spec is not None:
+                specs.append((os.path.join(ancestor, ""), spec))
+
+    for entry in entries:
+        if entry.name == ".gitignore":
+            if entry.is_file():
+                spec, _ = _read_gitignore_spec(Path(entry.path), entry.stat())
+                if spec is not None:
+                    specs.append((os.path.join(directory_str, ""), spec))
+            break
+
+    return _make_gitignore_matcher(specs)
+
+
+def _scan_top_level(
+    directory: Path, project_dir: Path, use_gitignore: bool
+) -> Optional[Tuple[List[str], List[Tuple[str, str]], Optional[Callable[[str], bool]]]]:
+    """Read the directory a walk starts from and load its gitignore matcher.
 
-        for file in files:
-            rel_file_path = str(rel_root / file)
-            discovered_files.append(rel_file_path)
+    Returns:
+        Tuple of (relative file paths, subdirectories to walk, matcher), or
+        None if the directory is outside project_dir or cannot be read
+    """
+    # Derive the relative prefix by string slicing instead of Path.relative_to
+    directory_str = str(directory)
+    project_prefix = os.path.join(str(project_dir), "")
+    if directory_str == str(project_dir):
+        rel_start = ""
+    elif directory_str.startswith(project_prefix):
+        rel_start = directory_str[len(project_prefix) :].replace(os.sep, "/") + "/"
+    else:
+        return None
 
-    return discovered_files
+    try:
+        with os.scandir(directory_str) as entries:
+            top_entries = list(entries)
+    except OSError as e:
+        logger.debug("Skipping unreadable directory %s: %s", directory_str, e)
+        return None
+
+    matcher = (
+        _gitignore_matcher_for_walk(directory_str, project_dir, rel_start, top_entries)
+        if use_gitignore
+        else None
+    )
+    files, subdirs = _scan_entries(top_entries, rel_start, matcher)
+    return files, subdirs, matcher
 
 
-def read_gitignore_rules(
-    gitignore_path: Path,
-) -> Tuple[Optional[Callable[[str], bool]], Optional[str]]:
-    """Read and parse a .gitignore file to create a matcher function.
+def _iter_discovered_files(
+    directory: Path, project_dir: Path, use_gitignore: bool = False
+) -> Iterator[str]:
+    """Yield files as the walk finds them; the streaming form of _discover_files.
+
+    Subtrees are walked one after another so that results can be consumed
+    while the walk is still in progress.
+    """
+    top_level = _scan_top_level(directory, project_dir, use_gitignore)
+    if top_level is None:
+        return
+    files, subdirs, matcher = top_level
+    yield from files
+    for abs_dir, rel_prefix in subdirs:
+        yield from _iter_subtree(abs_dir, rel_prefix, matcher)
+
+
+def _discover_files(
+    directory: Path,
+    project_dir: Path,
+    use_gitignore: bool = False,
+) -> List[str]:
+    """Discover all files recursively, excluding version-control directories.
+
+    Walks iteratively with ``os.scandir`` so entry types come from the
+    directory read itself rather than a separate ``stat`` per entry, and
+    builds relative paths by string concatenation instead of ``Path`` math.
+    Returned paths always use ``/`` separators, so consumers never need to
+    normalize them per file.
 
     Args:
-        gitignore_path: Path to the .gitignore file
+        directory: Directory to walk
+        project_dir: Base directory the returned paths are relative to
+        use_gitignore: Apply the .gitignore files from project_dir down to
+            the directory while walking; ignored directories are pruned
+            instead of walked and filtered
 
     Returns:
-        A tuple containing (matcher_function, gitignore_content), or (None, None) if file doesn't exist
+        List of ``/``-separated file paths relative to project_dir
     """
-    if not gitignore_path.is_file():
-        logger.info("No .gitignore file found at %s", gitignore_path)
-        return None, None
+    top_level = _scan_top_level(directory, project_dir, use_gitignore)
+    if top_level is None:
+        return []
+    discovered_files, subdirs, matcher = top_level
 
-    try:
-        # Read the gitignore file content for logging
-        with open(gitignore_path, "r") as f:
-            gitignore_content = f.read()
+    for abs_dir, rel_prefix in subdirs:
+        discovered_files.extend(_iter_subtree(abs_dir, rel_prefix, matcher))
+    return discovered_files
 
-        logger.info("Gitignore content: %s", gitignore_content)
 
-        # Parse the gitignore file to get a matcher function
-        logger.info("Parsing gitignore file at %s", gitignore_path)
-        parser = IgnoreParser()
-        parser.parse_rule_file(gitignore_path)
+def _has_gitignore_patterns(content: str) -> bool:
+    """Check whether gitignore content contains at least one pattern line."""
+    for line in content.splitlines():
+        stripped = line.strip()
+        if stripped and not stripped.startswith("#"):
+            return True
+    return False
 
-        # Create a matcher function that mimics the behavior of the old parse_gitignore
-        def matcher(path: str) -> bool:
-            return bool(parser.match(path))
 
-        return matcher, gitignore_content
+def _make_gitignore_matcher(
+    specs: List[Tuple[str, GitIgnoreSpec]],
+) -> Optional[Callable[[str], bool]]:
+    """Build one matcher from gitignore specs, ordered outermost first.
 
-    except Exception as e:
-        logger.warning("Error reading/parsing gitignore: %s", str(e))
-        return None, None
+    Each spec matches paths relative to its directory prefix. With several
+    specs the innermost one with a matching rule decides, so a deeper
+    .gitignore can re-include what an outer one ignores.
+    """
+    if not specs:
+        return None
 
+    if len(specs) == 1:
+        base_prefix, spec = specs[0]
 
-def apply_gitignore_filter(
-    file_paths: List[str], matcher: Optional[Callable[[str], bool]], project_dir: Path
-) -> List[str]:
-    """Filter a list of file paths using a gitignore matcher function.
+        def match_path(path: str) -> bool:
+            if not path.startswith(base_prefix):
+                return False
+            return spec.match_file(path[len(base_prefix) :])
 
-    Args:
-        file_paths: List of file paths to filter
-        matcher: Function that takes a path and returns True if it should be ignored
-        project_dir: Base directory for resolving relative paths to absolute
+        return match_path
+
+    innermost_first = specs[::-1]
+
+    def match_combined(path: str) -> bool:
+        for base_prefix, spec in innermost_first:
+            if path.startswith(base_prefix):
+                include = spec.check_file(path[len(base_prefix) :]).include
+                if include is not None:
+                    return include
+        return False
+
+    return match_combined
+
+
+def _read_gitignore_entry(
+    gitignore_path: Path,
+    file_stat: Optional[os.stat_result] = None,
+) -> Optional[Tuple[Optional[GitIgnoreSpec], Optional[Callable[[str], bool]], str]]:
+    """Load the compiled spec, matcher and content of a .gitignore file.
+
+    Entries are cached per path and reused until the file's modification
+    time or size changes.
 
     Returns:
-        Filtered list of file paths that are not ignored
+        Tuple of (spec, matcher, content), or None if the file doesn't exist
+        or cannot be read
     """
-    if matcher is None:
-        return file_paths
+    st = file_stat
+    if st is None:
+        try:
+            st = os.stat(gitignore_path)
+        except OSError:
+            st = None
 
-    filtered_files = []
+    if st is None or not stat.S_ISREG(st.st_mode):
+        logger.debug("No .gitignore file found at %s", gitignore_path)
+        return None
 
-    # Validate project_dir parameter
-    if project_dir is None:
-        raise ValueError("Project directory cannot be None")
+    cache_key = str(gitignore_path)
+    with _gitignore_cache_lock:
+        cached = _gitignore_cache.get(cache_key)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2], cached[3], cached[4]
 
-    for file_path in file_paths:
-        # Convert to absolute path for the matcher
-        abs_file_path = str(project_dir / file_path)
+    try:
+        # Read the file once; the rules are fed to the parser from this content
+        # instead of letting it open the file a second time
+        with open(gitignore_path, "r") as f:
+            gitignore_content = f.read()
 
-        # The matcher returns True if the file should be ignored
-        if not matcher(abs_file_path):
-            filtered_files.append(file_path)
+        logger.debug("Gitignore content: %s", gitignore_content)
+
+        spec: Optional[GitIgnoreSpec] = None
+        matcher: Optional[Callable[[str], bool]] = None
+        if _has_gitignore_patterns(gitignore_content):
+            # Compile all patterns into one spec that matches paths relative
+            # to the directory containing the .gitignore
+            logger.info("Parsing gitignore file at %s", gitignore_path)
+            spec = GitIgnoreSpec.from_lines(gitignore_content.splitlines())
+            base_prefix = os.path.join(str(gitignore_path.parent), "")
+            matcher = _make_gitignore_matcher([(base_prefix, spec)])
+        else:
+            # Nothing to match: callers skip filtering entirely
+            logger.info("No patterns in gitignore file at %s", gitignore_path)
+
+        with _gitignore_cache_lock:
+            _gitignore_cache[cache_key] = (
+                st.st_mtime_ns,
+                st.st_size,
+                spec,
+                matcher,
+                gitignore_content,
+            )
+
+        return spec, matcher, gitignore_content
 
-    logger.info(
-        "Applied gitignore filtering: %s files found, %s after filtering",
-        len(file_paths),
-        len(filtered_files),
-    )
-    return filtered_files
+    except Exception as e:
+        logger.warning("Error reading/parsing gitignore: %s", str(e))
+        return None
 
 
-def filter_with_gitignore(
-    file_paths: List[str], base_dir: Path, project_dir: Path
-) -> List[str]:
-    """Filter a list of file paths using .gitignore rules.
+def _read_gitignore_spec(
+    gitignore_path: Path,
+    file_stat: Optional[os.stat_result] = None,
+) -> Tuple[Optional[GitIgnoreSpec], Optional[str]]:
+    """Read a .gitignore file into a compiled spec and its content."""
+    cached = _read_gitignore_entry(gitignore_path, file_stat)
+    if cached is None:
+        return None, None
+    return cached[0], cached[2]
+
+
+def read_gitignore_rules(
+    gitignore_path: Path,
+    file_stat: Optional[os.stat_result] = None,
+) -> Tuple[Optional[Callable[[str], bool]], Optional[str]]:
+    """Read and parse a .gitignore file to create a matcher function.
+
+    Parsed matchers are cached per path and reused until the file's
+    modification time or size changes. A file without any patterns (only
+    blank lines and comments) yields no matcher, so callers skip filtering.
+
+    The matcher takes an absolute path. A trailing separator marks the path
+    as a directory, which directory-only patterns such as ``build/`` need.
 
     Args:
-        file_paths: List of file paths to filter
-        base_dir: Directory containing the .gitignore file
-        project_dir: Project directory path
+        gitignore_path: Path to the .gitignore file
+        file_stat: Stat result for the file if the caller already has one
 
     Returns:
-        List of file paths that are not ignored
+        A tuple containing (matcher_function, gitignore_content), or (None, None) if file doesn't exist
     """
-    gitignore_path = base_dir / ".gitignore"
-
-    # Get the matcher function from the gitignore file
-    matcher, _ = read_gitignore_rules(gitignore_path)
-
-    if matcher is None:
-        return file_paths
+    cached = _read_gitignore_entry(gitignore_path, file_stat)
+    if cached is None:
+        return None, None
+    return cached[1], cached[2]
 
-    # Use the matcher for more complex gitignore patterns
-    return apply_gitignore_filter(file_paths, matcher, project_dir)
 
+def clear_gitignore_cache() -> None:
+    """Clear the parsed .gitignore cache (for testing)."""
+    with _gitignore_cache_lock:
+        _gitignore_cache.clear()
 
-def list_files(
-    directory: Union[str, Path], project_dir: Path, use_gitignore: bool = True
-) -> List[str]:
-    """List all files in a directory and its subdirectories with optional gitignore filtering.
 
-    Args:
-        directory: Directory to list files from
-        project_dir: Project directory path
-        use_gitignore: Whether to apply gitignore filtering
+def _resolve_listing_directory(
+    directory: Union[str, Path], project_dir: Path
+) -> Tuple[Path, str]:
+    """Validate a directory to list and resolve it within project_dir.
 
     Returns:
-        List of file paths
+        Tuple of (absolute path, relative path)
     """
     # Validate project_dir parameter
     if project_dir is None:
@@ -195,16 +417,54 @@ def list_files(
     if not abs_path.is_dir():
         raise NotADirectoryError(f"Path '{directory}' is not a directory")
 
-    try:
-        all_files = _discover_files(abs_path, project_dir)
-        logger.info("Discovered %s files in %s", len(all_files), rel_path)
+    return abs_path, rel_path
 
-        if not use_gitignore:
-            return all_files
 
-        # Apply gitignore filtering
-        return filter_with_gitignore(all_files, abs_path, project_dir)
+def list_files(
+    directory: Union[str, Path],
+    project_dir: Path,
+    use_gitignore: bool = True,
+) -> List[str]:
+    """List all files in a directory and its subdirectories with optional gitignore filtering.
+
+    Args:
+        directory: Directory to list files from
+        project_dir: Project directory path
+        use_gitignore: Whether to apply gitignore filtering
+
+    Returns:
+        List of file paths
+    """
+    abs_path, rel_path = _resolve_listing_directory(directory, project_dir)
+
+    try:
+        # Gitignore rules are applied during the walk itself
+        all_files = _discover_files(abs_path, project_dir, use_gitignore)
+        logger.info("Discovered %s files in %s", len(all_files), rel_path)
+        return all_files
 
     except Exception as e:
         logger.error("Error listing files in directory %s: %s", rel_path, str(e))
         raise
+
+
+def iter_files(
+    directory: Union[str, Path], project_dir: Path, use_gitignore: bool = True
+) -> Iterator[str]:
+    """Iterate over all files in a directory and its subdirectories.
+
+    Same results as list_files, but paths are yielded while the directory
+    tree is walked, so callers can start working on the first files before
+    the walk finishes and never hold the full list in memory. The directory
+    is validated immediately, before iteration starts.
+
+    Args:
+        directory: Directory to list files from
+        project_dir: Project directory path
+        use_gitignore: Whether to apply gitignore filtering
+
+    Returns:
+        Iterator over file paths
+    """
+    abs_path, _ = _resolve_listing_directory(directory, project_dir)
+    return _iter_discovered_files(abs_path, project_dir, use_gitignore)
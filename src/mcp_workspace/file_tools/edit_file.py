@@ -1,12 +1,33 @@
 import difflib
 import logging
+import os
+import re
+import stat
+from collections import Counter
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
+from mcp_workspace.file_tools.file_operations import write_file_atomically
 from mcp_workspace.file_tools.path_utils import normalize_line_endings, normalize_path
 
 logger = logging.getLogger(__name__)
 
+# Unchanged lines shown around each diff hunk (difflib's default)
+_DIFF_CONTEXT_LINES = 3
+
+_HUNK_HEADER_RE = re.compile(r"@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@")
+
+# difflib ignores lines that make up more than 1% of a sequence of at least
+# this many lines (SequenceMatcher's autojunk heuristic)
+_AUTOJUNK_MIN_LINES = 200
+
+# Most distinct changed lines looked up in the unchanged text before the diff
+# falls back to comparing the full line lists
+_MAX_SEARCHED_LINES = 32
+
+# Line boundaries str.splitlines() recognizes besides "\n" and "\r\n"
+_OTHER_LINE_BREAK_RE = re.compile("\r(?!\n)|[\x0b\x0c\x1c-\x1e\x85\u2028\u2029]")
+
 
 def edit_file(
     file_path: str,
@@ -14,6 +35,7 @@ def edit_file(
     new_string: str,
     replace_all: bool = False,
     project_dir: Optional[Path] = None,
+    return_diff: bool = True,
 ) -> str:
     """Make a selective edit to a file using exact string matching.
 
@@ -24,10 +46,13 @@ def edit_file(
         replace_all: If True, replace all occurrences. If False and multiple
             matches exist, raises ValueError.
         project_dir: Base directory for relative paths.
+        return_diff: If False, skip building the diff, which is the costliest
+            step on large files, and return "Edit applied" instead.
 
     Returns:
-        Diff string on success, or "No changes needed - edit already applied"
-        if the edit was already applied.
+        Diff string on success ("Edit applied" if return_diff is False), or
+        "No changes needed - edit already applied" if the edit was already
+        applied.
 
     Raises:
         FileNotFoundError: If the file does not exist.
@@ -43,15 +68,22 @@ def edit_file(
     else:
         abs_path = Path(file_path)
 
-    if not abs_path.exists():
-        raise FileNotFoundError(f"File not found: {abs_path}")
+    # Edit the file a symlink points at; replacing the link itself would turn
+    # it into a regular file and leave the target unchanged
+    real_path = Path(os.path.realpath(abs_path))
+
+    # One stat answers both "exists" and "is a regular file"
+    try:
+        st = os.stat(real_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise FileNotFoundError(f"File not found: {abs_path}") from None
 
-    if not abs_path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         raise ValueError(f"Not a file: {abs_path}")
 
-    # Read and normalize content
-    with open(abs_path, "r", encoding="utf-8") as f:
-        original_content = normalize_line_endings(f.read())
+    # Read and normalize content; decoding the bytes in one call skips the
+    # text wrapper, and normalize_line_endings handles what it would translate
+    original_content = normalize_line_endings(real_path.read_bytes().decode("utf-8"))
 
     old_string = normalize_line_endings(old_string)
     new_string = normalize_line_endings(new_string)
@@ -59,14 +91,22 @@ def edit_file(
     # Empty old_string → prepend new_string
     if not old_string:
         modified_content = new_string + original_content
-        _write_file(abs_path, modified_content)
-        return _create_diff(original_content, modified_content, file_path)
+        _write_edited_file(real_path, file_path, modified_content, st)
+        if not return_diff:
+            return "Edit applied"
+        return _create_diff(
+            original_content, modified_content, file_path, (0, 0, len(new_string))
+        )
 
-    # Check if old_string exists in content
-    if old_string in original_content:
-        count = original_content.count(old_string)
+    # Locate the first match once; the checks and the splice below reuse it
+    pos = original_content.find(old_string)
+    if pos >= 0:
+        end = pos + len(old_string)
 
-        if count > 1 and not replace_all:
+        # A second non-overlapping match is all that matters; count only for
+        # the error message
+        if not replace_all and original_content.find(old_string, end) >= 0:
+            count = original_content.count(old_string)
             raise ValueError(
                 f"Multiple matches ({count}) found for {_truncate(old_string)}. "
                 f"Use replace_all=True to replace all occurrences, or provide "
@@ -74,17 +114,25 @@ def edit_file(
             )
 
         # Position-aware already-applied check
-        if _is_position_aware_already_applied(original_content, old_string, new_string):
+        if _is_position_aware_already_applied(
+            original_content, pos, old_string, new_string
+        ):
             return "No changes needed - edit already applied"
 
-        # Apply replacement
+        # Apply replacement; a single splice also tells the diff where to look
+        changed: Optional[Tuple[int, int, int]] = None
         if replace_all:
             modified_content = original_content.replace(old_string, new_string)
         else:
-            modified_content = original_content.replace(old_string, new_string, 1)
+            modified_content = (
+                original_content[:pos] + new_string + original_content[end:]
+            )
+            changed = (pos, end, pos + len(new_string))
 
-        _write_file(abs_path, modified_content)
-        return _create_diff(original_content, modified_content, file_path)
+        _write_edited_file(real_path, file_path, modified_content, st)
+        if not return_diff:
+            return "Edit applied"
+        return _create_diff(original_content, modified_content, file_path, changed)
 
     # old_string not found — check contextual already-applied
     if _is_edit_already_applied(original_content, old_string, new_string):
@@ -102,27 +150,35 @@ def edit_file(
     raise ValueError(f"Text not found in {abs_path}: {_truncate(old_string)}")
 
 
-def _write_file(path: Path, content: str) -> None:
-    """Write content to file."""
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(content)
+def _write_edited_file(
+    path: Path, file_path: str, content: str, st: os.stat_result
+) -> None:
+    """Write the edited content, atomically unless the file has hard links.
+
+    Replacing a hard-linked file would detach it from its other links, so
+    such files are rewritten in place instead.
+    """
+    if st.st_nlink > 1:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+    else:
+        write_file_atomically(path, file_path, content, st)
 
 
 def _is_position_aware_already_applied(
-    content: str, old_string: str, new_string: str
+    content: str, pos: int, old_string: str, new_string: str
 ) -> bool:
     """Check if edit is already applied using position-aware detection.
 
     When new_string is longer than old_string and old_string is a prefix of
     new_string, the old_string will still be found in content even after the
-    edit is applied. This checks if the content at the match position already
-    contains new_string.
+    edit is applied. This checks if the content at the match position ``pos``
+    already contains new_string.
     """
     if len(new_string) <= len(old_string):
         return False
 
-    pos = content.find(old_string)
-    return content[pos : pos + len(new_string)] == new_string
+    return content.startswith(new_string, pos)
 
 
 def _truncate(text: str, max_len: int = 50) -> str:
@@ -132,19 +188,295 @@ def _truncate(text: str, max_len: int = 50) -> str:
     return text[: max_len - 3] + "..."
 
 
-def _create_diff(original: str, modified: str, filename: str) -> str:
-    """Create unified diff between original and modified content."""
+def _create_diff(
+    original: str,
+    modified: str,
+    filename: str,
+    changed: Optional[Tuple[int, int, int]] = None,
+) -> str:
+    """Create unified diff between original and modified content.
+
+    Lines shared at the start and end of both versions are trimmed (keeping
+    the context lines) before difflib compares the rest, so an edit in a
+    large file only costs a line comparison for the unchanged part. Hunk
+    headers are shifted back to line numbers of the full file. Where difflib
+    could align the trimmed lines differently than the full ones, the full
+    lines are compared, so the diff is always the one of the full content.
+
+    Args:
+        original: Content before the edit.
+        modified: Content after the edit.
+        filename: Path shown in the diff headers.
+        changed: Optional ``(start, old_end, new_end)`` character offsets of
+            a single replaced span, with ``original[:start]`` and
+            ``original[old_end:]`` left unchanged in ``modified``. When
+            given, only the lines around that span are split and compared,
+            unless the content breaks lines on anything other than "\\n".
+    """
     filename = filename.replace("\\", "/")
+    # The window is located, and its lines looked up, by "\n", which only
+    # matches how splitlines() breaks the content if "\n" is its only line
+    # boundary, in the original and in the replacement text
+    if (
+        changed is None
+        or _OTHER_LINE_BREAK_RE.search(original)
+        or _OTHER_LINE_BREAK_RE.search(modified, changed[0], changed[2])
+    ):
+        original_lines, modified_lines, line_offset = _trim_common_lines(
+            original, modified
+        )
+    else:
+        original_lines, modified_lines, line_offset = _trim_around_span(
+            original, modified, changed
+        )
+
+    diff_lines = difflib.unified_diff(
+        original_lines,
+        modified_lines,
+        fromfile=f"a/{filename}",
+        tofile=f"b/{filename}",
+        n=_DIFF_CONTEXT_LINES,
+    )
+    if not line_offset:
+        return "".join(diff_lines)
+    return "".join(
+        _shift_hunk_header(line, line_offset) if line.startswith("@@ ") else line
+        for line in diff_lines
+    )
+
+
+def _trim_common_lines(
+    original: str, modified: str
+) -> Tuple[List[str], List[str], int]:
+    """Split both versions into lines, trimmed to the edit and its context.
+
+    Returns:
+        Tuple of (original lines, modified lines, number of lines trimmed
+        from the top); the lines are left whole if trimming could change
+        the diff
+    """
     original_lines = original.splitlines(keepends=True)
     modified_lines = modified.splitlines(keepends=True)
+    # The trimming checks search the text for lines ending in "\n"
+    if _OTHER_LINE_BREAK_RE.search(original) or _OTHER_LINE_BREAK_RE.search(modified):
+        return original_lines, modified_lines, 0
 
-    return "".join(
-        difflib.unified_diff(
-            original_lines,
-            modified_lines,
-            fromfile=f"a/{filename}",
-            tofile=f"b/{filename}",
+    prefix, suffix = _count_common_lines(original_lines, modified_lines)
+    if not _trimming_keeps_diff(
+        original, modified, original_lines, modified_lines, prefix, suffix
+    ):
+        return original_lines, modified_lines, 0
+    return _cut_to_context(original_lines, modified_lines, prefix, suffix)
+
+
+def _trim_around_span(
+    original: str, modified: str, changed: Tuple[int, int, int]
+) -> Tuple[List[str], List[str], int]:
+    """Split only the lines around a replaced span, trimmed like _trim_common_lines.
+
+    Args:
+        original: Content before the edit; "\\n" is its only line break.
+        modified: Content after the edit.
+        changed: ``(start, old_end, new_end)`` offsets of the replaced span.
+    """
+    span_start, old_end, new_end = changed
+    lines_below = _DIFF_CONTEXT_LINES
+    while True:
+        window_start, window_end = _context_window(
+            original, span_start, old_end, lines_below
         )
+        original_lines = original[window_start:window_end].splitlines(keepends=True)
+        modified_lines = modified[
+            window_start : window_end + new_end - old_end
+        ].splitlines(keepends=True)
+        prefix, suffix = _count_common_lines(original_lines, modified_lines)
+        # Repeated lines can carry the common prefix past the edit; widen
+        # the window until the trimming ends inside it, as it would on
+        # the full file
+        if suffix >= _DIFF_CONTEXT_LINES or window_end == len(original):
+            break
+        lines_below *= 2
+
+    line_count = original.count("\n") + bool(original) - original.endswith("\n")
+    if not _trimming_keeps_diff(
+        original,
+        modified,
+        original_lines,
+        modified_lines,
+        prefix,
+        suffix,
+        window_start,
+        line_count + len(modified_lines) - len(original_lines),
+    ):
+        return original.splitlines(keepends=True), modified.splitlines(keepends=True), 0
+    original_lines, modified_lines, start = _cut_to_context(
+        original_lines, modified_lines, prefix, suffix
+    )
+    return original_lines, modified_lines, original.count("\n", 0, window_start) + start
+
+
+def _cut_to_context(
+    original_lines: List[str], modified_lines: List[str], prefix: int, suffix: int
+) -> Tuple[List[str], List[str], int]:
+    """Drop the common lines beyond the context lines around the edit."""
+    start = max(0, prefix - _DIFF_CONTEXT_LINES)
+    trailing = max(0, suffix - _DIFF_CONTEXT_LINES)
+    return (
+        original_lines[start : len(original_lines) - trailing],
+        modified_lines[start : len(modified_lines) - trailing],
+        start,
+    )
+
+
+def _count_common_lines(
+    original_lines: List[str], modified_lines: List[str]
+) -> Tuple[int, int]:
+    """Count lines shared at the start and, after those, at the end."""
+    max_common = min(len(original_lines), len(modified_lines))
+    prefix = 0
+    while prefix < max_common and original_lines[prefix] == modified_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < max_common - prefix
+        and original_lines[-1 - suffix] == modified_lines[-1 - suffix]
+    ):
+        suffix += 1
+    return prefix, suffix
+
+
+def _trimming_keeps_diff(
+    original: str,
+    modified: str,
+    original_lines: List[str],
+    modified_lines: List[str],
+    prefix: int,
+    suffix: int,
+    first_offset: int = 0,
+    modified_line_count: Optional[int] = None,
+) -> bool:
+    """Check that difflib diffs the trimmed lines as it would the full text.
+
+    difflib anchors on the longest matching blocks, which only stay the
+    common lines around the edit while no changed line occurs among them
+    and the two lines meeting at a pure insertion or deletion don't recur
+    as a pair; otherwise difflib may move the edit within repeated lines or
+    take unchanged lines into it. Its autojunk heuristic must also treat
+    the trimmed and the full lines alike.
+
+    Args:
+        original: Content before the edit; "\\n" is its only line break.
+        modified: Content after the edit.
+        original_lines: Lines of original, or of a part of it that holds
+            the edit and starts at ``first_offset``.
+        modified_lines: The corresponding lines of modified.
+        prefix: Number of lines both line lists start with.
+        suffix: Number of lines both line lists end with, after the prefix.
+        first_offset: Offset in original of the first of original_lines.
+        modified_line_count: Number of lines of modified, if modified_lines
+            doesn't cover all of it.
+    """
+    old_end = len(original_lines) - suffix
+    new_end = len(modified_lines) - suffix
+    old_changed = original_lines[prefix:old_end]
+    new_changed = modified_lines[prefix:new_end]
+    changed_lines = set(old_changed).union(new_changed)
+    if len(changed_lines) > _MAX_SEARCHED_LINES:
+        return False
+
+    changed_start = first_offset + sum(map(len, original_lines[:prefix]))
+    changed_end = changed_start + sum(map(len, old_changed))
+    for line in changed_lines:
+        if _has_line(original, line, 0, changed_start) or _has_line(
+            original, line, changed_end, len(original)
+        ):
+            return False
+
+    if (
+        not (old_changed and new_changed)
+        and 0 < changed_start
+        and changed_end < len(original)
+    ):
+        # The last line above and the first line below the edit are adjacent
+        # in one version; that pair recurring elsewhere is a longer match
+        above_start = original.rfind("\n", 0, changed_start - 1) + 1
+        below_end = original.find("\n", changed_end) + 1 or len(original)
+        pair = original[above_start:changed_start] + original[changed_end:below_end]
+        if _has_line(original, pair, 0, above_start + len(pair) - 1) or _has_line(
+            original, pair, changed_start, len(original)
+        ):
+            return False
+
+    trimmed_count = len(modified_lines) - max(0, prefix - _DIFF_CONTEXT_LINES)
+    trimmed_count -= max(0, suffix - _DIFF_CONTEXT_LINES)
+    if trimmed_count >= _AUTOJUNK_MIN_LINES:
+        return False
+    if modified_line_count is None:
+        modified_line_count = len(modified_lines)
+    if modified_line_count < _AUTOJUNK_MIN_LINES:
+        return True
+    # On the full text, none of the new lines may be dropped as junk, and one
+    # of the lines below the edit must remain to anchor the rest on
+    max_repeats = modified_line_count // 100 + 1
+    if new_changed and max(Counter(new_changed).values()) > max_repeats:
+        return False
+    following = original_lines[old_end : old_end + _DIFF_CONTEXT_LINES]
+    return not following or any(
+        not _occurs_more_than(modified, line, max_repeats) for line in following
+    )
+
+
+def _has_line(text: str, line: str, start: int, end: int) -> bool:
+    """Check whether text[start:end], starting at a line boundary, holds line."""
+    return text.startswith(line, start, end) or text.find("\n" + line, start, end) >= 0
+
+
+def _occurs_more_than(text: str, line: str, limit: int) -> bool:
+    """Check whether line occurs in text, at line boundaries, over limit times."""
+    count = int(text.startswith(line))
+    pos = text.find("\n" + line)
+    while pos >= 0:
+        count += 1
+        if count > limit:
+            return True
+        # Consecutive occurrences share the "\n" between them
+        pos = text.find("\n" + line, pos + 1)
+    return count > limit
+
+
+def _context_window(
+    text: str, start: int, end: int, lines_below: int
+) -> Tuple[int, int]:
+    """Return offsets of the whole lines spanning text[start:end] plus context.
+
+    The window starts at a line boundary ``_DIFF_CONTEXT_LINES`` lines above
+    the line holding ``start`` and ends ``lines_below`` lines after the line
+    holding ``end``, clamped to the text.
+    """
+    window_start = text.rfind("\n", 0, start) + 1
+    for _ in range(_DIFF_CONTEXT_LINES):
+        if not window_start:
+            break
+        window_start = text.rfind("\n", 0, window_start - 1) + 1
+
+    window_end = start
+    for _ in range(lines_below + 1):
+        newline = text.find("\n", max(window_end, end))
+        if newline < 0:
+            return window_start, len(text)
+        window_end = newline + 1
+    return window_start, window_end
+
+
+def _shift_hunk_header(header: str, offset: int) -> str:
+    """Add offset to both start line numbers of a unified diff hunk header."""
+    match = _HUNK_HEADER_RE.match(header)
+    if match is None:
+        return header
+    old_start, old_len, new_start, new_len = match.groups()
+    return (
+        f"@@ -{int(old_start) + offset}{old_len or ''} "
+        f"+{int(new_start) + offset}{new_len or ''} @@\n"
     )
 
 
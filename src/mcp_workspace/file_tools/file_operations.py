@@ -3,9 +3,11 @@
 import logging
 import os
 import shutil
+import stat
 import tempfile
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set
 
 from mcp_coder_utils.log_utils import log_function_call
 
@@ -18,6 +20,45 @@
 
 logger = logging.getLogger(__name__)
 
+# fdatasync skips flushing metadata such as mtime; macOS and Windows only
+# provide fsync
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+# Project dirs already found to be git repositories. Only positive results
+# are kept: a repository rarely stops being one, and a failing git mv falls
+# back to a filesystem move anyway, while a fresh `git init` is picked up
+_git_project_dirs: Set[Path] = set()
+_git_project_dirs_lock = threading.Lock()
+
+
+def _require_regular_file(
+    abs_path: Path, file_path: str, not_file_reason: str = "is not a file"
+) -> os.stat_result:
+    """Stat a path once and make sure it is an existing regular file.
+
+    Args:
+        abs_path: Absolute path to check
+        file_path: Path as given by the caller, for messages
+        not_file_reason: Message tail when the path is not a regular file
+
+    Returns:
+        The stat result of the file
+
+    Raises:
+        FileNotFoundError: If the path does not exist
+        IsADirectoryError: If the path is not a regular file
+    """
+    try:
+        st = os.stat(abs_path)
+    except (FileNotFoundError, NotADirectoryError):
+        logger.error("File not found: %s", file_path)
+        raise FileNotFoundError(f"File '{file_path}' does not exist") from None
+
+    if not stat.S_ISREG(st.st_mode):
+        logger.error("Path is not a file: %s", file_path)
+        raise IsADirectoryError(f"Path '{file_path}' {not_file_reason}")
+    return st
+
 
 def read_file(
     file_path: str,
@@ -78,29 +119,28 @@ def read_file(
     # Normalize the path to be relative to the project directory
     abs_path, rel_path = normalize_path(file_path, project_dir)
 
-    if not abs_path.exists():
-        logger.error("File not found: %s", file_path)
-        raise FileNotFoundError(f"File '{file_path}' does not exist")
+    _require_regular_file(abs_path, file_path)
 
-    if not abs_path.is_file():
-        logger.error("Path is not a file: %s", file_path)
-        raise IsADirectoryError(f"Path '{file_path}' is not a file")
+    # Resolve with_line_numbers default
+    if with_line_numbers is None:
+        with_line_numbers = start_line is not None
 
-    file_handle = None
     try:
         logger.debug("Reading file: %s", rel_path)
-        file_handle = open(abs_path, "r", encoding="utf-8")
+        if start_line is None and not with_line_numbers:
+            # Plain full read: one read and one decode; normalizing line
+            # endings matches the universal newlines of a text-mode read
+            content = normalize_line_endings(abs_path.read_bytes().decode("utf-8"))
+            logger.debug("Successfully read %s", rel_path)
+            return content
 
         collected: list[tuple[int, str]] = []
-        for line_num, line in enumerate(file_handle, start=1):
-            if start_line is None or (start_line <= line_num <= end_line):  # type: ignore[operator]
-                collected.append((line_num, line))
-            if end_line is not None and line_num >= end_line:
-                break
-
-        # Resolve with_line_numbers default
-        if with_line_numbers is None:
-            with_line_numbers = start_line is not None
+        with open(abs_path, "r", encoding="utf-8") as file_handle:
+            for line_num, line in enumerate(file_handle, start=1):
+                if start_line is None or (start_line <= line_num <= end_line):  # type: ignore[operator]
+                    collected.append((line_num, line))
+                if end_line is not None and line_num >= end_line:
+                    break
 
         if not with_line_numbers or not collected:
             content = "".join(line for _, line in collected)
@@ -122,9 +162,6 @@ def read_file(
     except Exception as e:
         logger.error("Error reading file %s: %s", rel_path, str(e))
         raise
-    finally:
-        if file_handle is not None:
-            file_handle.close()
 
 
 def _validate_save_parameters(
@@ -191,13 +228,73 @@ def _create_parent_directories(abs_path: Path) -> None:
         raise
 
 
-def _write_file_atomically(abs_path: Path, rel_path: str, content: str) -> bool:
+def _encode_content(content: str, rel_path: str) -> bytes:
+    """Encode content for writing, translating newlines as text mode would.
+
+    Args:
+        content: Content to encode
+        rel_path: Relative path for logging
+
+    Returns:
+        The UTF-8 encoded content
+
+    Raises:
+        ValueError: If content cannot be encoded
+    """
+    if os.linesep != "\n":
+        content = content.replace("\n", os.linesep)
+    try:
+        return content.encode("utf-8")
+    except UnicodeEncodeError as e:
+        logger.error("Unicode encode error while writing to %s: %s", rel_path, str(e))
+        raise ValueError(
+            "Content contains characters that cannot be encoded. Please check the encoding."
+        ) from e
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write all of data to a file descriptor, resuming after partial writes."""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _copy_file_attributes(path: str, existing: os.stat_result) -> None:
+    """Give path the permission bits and, where allowed, the owner of existing.
+
+    Args:
+        path: File to update
+        existing: Stat of the file whose attributes to copy
+    """
+    os.chmod(path, stat.S_IMODE(existing.st_mode))
+    if os.name == "nt":
+        return
+    current = os.stat(path)
+    if (current.st_uid, current.st_gid) == (existing.st_uid, existing.st_gid):
+        return
+    try:
+        os.chown(path, existing.st_uid, existing.st_gid)
+    except PermissionError:
+        # Only root may give files away; the new file keeps our ownership
+        logger.debug("Could not keep the owner of %s", path)
+
+
+def write_file_atomically(
+    abs_path: Path,
+    rel_path: str,
+    content: str,
+    existing: Optional[os.stat_result] = None,
+) -> bool:
     """Write file atomically using a temporary file.
 
     Args:
         abs_path: Absolute path to file
         rel_path: Relative path for logging
         content: Content to write
+        existing: Stat of the file being replaced, whose permission bits
+            and owner carry over; the temporary file is created with
+            owner-only permissions otherwise
 
     Returns:
         True if successful
@@ -206,6 +303,9 @@ def _write_file_atomically(abs_path: Path, rel_path: str, content: str) -> bool:
         ValueError: If content cannot be encoded
         Exception: For other write errors
     """
+    # Encode up front so an encoding error leaves no temporary file behind
+    data = _encode_content(content, rel_path)
+
     # Use a temporary file for atomic write
     temp_file = None
     try:
@@ -216,30 +316,28 @@ def _write_file_atomically(abs_path: Path, rel_path: str, content: str) -> bool:
 
         logger.debug("Writing to temporary file for %s", rel_path)
 
-        # Write content to temporary file
-        with open(temp_fd, "w", encoding="utf-8") as f:
-            try:
-                f.write(content)
-            except UnicodeEncodeError as e:
-                logger.error(
-                    "Unicode encode error while writing to %s: %s", rel_path, str(e)
-                )
-                raise ValueError(
-                    "Content contains characters that cannot be encoded. Please check the encoding."
-                ) from e
+        # Write the bytes straight to the descriptor and flush them to disk,
+        # so the rename below can never expose an empty or partial file
+        try:
+            _write_all(temp_fd, data)
+            _fdatasync(temp_fd)
+        finally:
+            os.close(temp_fd)
+
+        if existing is not None:
+            _copy_file_attributes(temp_path, existing)
 
         # Atomically replace the target file
         logger.debug("Atomically replacing %s with temporary file", rel_path)
         try:
-            # On Windows, we need to remove the target file first
-            if os.name == "nt" and abs_path.exists():
-                abs_path.unlink()
+            # os.replace overwrites an existing target on Windows too, so
+            # readers never see the file missing
             os.replace(temp_path, str(abs_path))
         except Exception as e:
             logger.error("Error replacing file %s: %s", rel_path, str(e))
             raise
 
-        logger.debug("Successfully wrote %s bytes to %s", len(content), rel_path)
+        logger.debug("Successfully wrote %s bytes to %s", len(data), rel_path)
         return True
 
     finally:
@@ -277,8 +375,14 @@ def save_file(file_path: str, content: Any, project_dir: Path) -> bool:
     # Create parent directories if needed
     _create_parent_directories(abs_path)
 
+    # Keep the permissions and owner of a file being overwritten
+    try:
+        existing: Optional[os.stat_result] = os.stat(abs_path)
+    except FileNotFoundError:
+        existing = None
+
     # Write file atomically
-    return _write_file_atomically(abs_path, rel_path, validated_content)
+    return write_file_atomically(abs_path, rel_path, validated_content, existing)
 
 
 # Keep write_file for backward compatibility
@@ -306,24 +410,21 @@ def append_file(file_path: str, content: Any, project_dir: Path) -> bool:
         file_path, content, project_dir
     )
 
-    # Check if the file exists
-    if not abs_path.exists():
-        logger.error("File not found: %s", file_path)
-        raise FileNotFoundError(f"File '{file_path}' does not exist")
-
-    if not abs_path.is_file():
-        logger.error("Path is not a file: %s", file_path)
-        raise IsADirectoryError(f"Path '{file_path}' is not a file")
-
-    # Read existing content
-    existing_content = read_file(file_path, project_dir)
-
-    # Append new content
-    combined_content = existing_content + validated_content
+    # Check that the file exists and is a regular file
+    _require_regular_file(abs_path, file_path)
 
-    # Use save_file to write the combined content
-    logger.debug("Appending %s bytes to %s", len(validated_content), rel_path)
-    return save_file(file_path, combined_content, project_dir)
+    # Write only the new content; O_APPEND positions every write at the end
+    # of the file, so the existing content is neither read nor rewritten
+    data = _encode_content(validated_content, rel_path)
+    logger.debug("Appending %s bytes to %s", len(data), rel_path)
+    fd = os.open(abs_path, os.O_WRONLY | os.O_APPEND | getattr(os, "O_BINARY", 0))
+    try:
+        _write_all(fd, data)
+        # Flush to disk like save_file does before it reports success
+        _fdatasync(fd)
+    finally:
+        os.close(fd)
+    return True
 
 
 def delete_file(file_path: str, project_dir: Path) -> bool:
@@ -355,13 +456,7 @@ def delete_file(file_path: str, project_dir: Path) -> bool:
     # Normalize the path to be relative to the project directory
     abs_path, rel_path = normalize_path(file_path, project_dir)
 
-    if not abs_path.exists():
-        logger.error("File not found: %s", file_path)
-        raise FileNotFoundError(f"File '{file_path}' does not exist")
-
-    if not abs_path.is_file():
-        logger.error("Path is not a file: %s", file_path)
-        raise IsADirectoryError(f"Path '{file_path}' is not a file or is a directory")
+    _require_regular_file(abs_path, file_path, "is not a file or is a directory")
 
     try:
         logger.debug("Deleting file: %s", rel_path)
@@ -423,6 +518,24 @@ def _validate_move_parameters(
     return src_abs, src_rel, dest_abs, dest_rel
 
 
+def _is_git_project(project_dir: Path) -> bool:
+    """Return whether project_dir is a git repository, remembering a yes."""
+    with _git_project_dirs_lock:
+        if project_dir in _git_project_dirs:
+            return True
+    if not is_git_repository(project_dir):
+        return False
+    with _git_project_dirs_lock:
+        _git_project_dirs.add(project_dir)
+    return True
+
+
+def clear_git_project_cache() -> None:
+    """Clear the cache of known git project directories (for testing)."""
+    with _git_project_dirs_lock:
+        _git_project_dirs.clear()
+
+
 def _determine_move_method(src_abs: Path, project_dir: Path) -> bool:
     """Determine if git should be used for the move operation.
 
@@ -433,7 +546,7 @@ def _determine_move_method(src_abs: Path, project_dir: Path) -> bool:
     Returns:
         True if git should be used, False otherwise
     """
-    if not is_git_repository(project_dir):
+    if not _is_git_project(project_dir):
         return False
 
     # Simply check if the source is tracked (for files)
@@ -2,19 +2,48 @@
 
 import logging
 import os
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Dict
 
 logger = logging.getLogger(__name__)
 
+# project_dir -> str(project_dir.resolve()); the project root does not move
+# while the server runs, so it is resolved once instead of on every call
+_resolved_project_dirs: Dict[Path, str] = {}
+_resolved_project_dirs_lock = threading.Lock()
+
 
 def normalize_line_endings(text: str) -> str:
     """Convert all line endings to Unix style (\n)."""
+    # Most content has no carriage returns; one scan settles that
+    if "\r" not in text:
+        return text
     text = text.replace("\r\n", "\n")
     text = text.replace("\r", "\n")
     return text
 
 
+def _resolve_project_dir(project_dir: Path) -> str:
+    """Return the resolved project directory, resolving each one only once."""
+    if not project_dir.is_absolute():
+        # A relative project dir depends on the working directory
+        return str(project_dir.resolve())
+    with _resolved_project_dirs_lock:
+        resolved = _resolved_project_dirs.get(project_dir)
+    if resolved is None:
+        resolved = str(project_dir.resolve())
+        with _resolved_project_dirs_lock:
+            _resolved_project_dirs[project_dir] = resolved
+    return resolved
+
+
+def clear_project_dir_cache() -> None:
+    """Clear the resolved project directory cache (for testing)."""
+    with _resolved_project_dirs_lock:
+        _resolved_project_dirs.clear()
+
+
 def normalize_path(path: str, project_dir: Path) -> tuple[Path, str]:
     """
     Normalize a path to be relative to the project directory.
@@ -53,9 +82,9 @@ def normalize_path(path: str, project_dir: Path) -> tuple[Path, str]:
         # During testing, resolve() may fail on non-existent paths, so handle that case
         try:
             resolved_path = absolute_path.resolve()
-            project_resolved = project_dir.resolve()
+            project_resolved = _resolve_project_dir(project_dir)
             # Check if the resolved path starts with the resolved project dir
-            if os.path.commonpath([resolved_path, project_resolved]) != str(
+            if os.path.commonpath([resolved_path, project_resolved]) != (
                 project_resolved
             ):
                 raise ValueError(
@@ -3,18 +3,18 @@
 import re
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from pathspec import PathSpec
 
-from mcp_workspace.file_tools.directory_utils import list_files
+from mcp_workspace.file_tools.directory_utils import iter_files
 from mcp_workspace.file_tools.path_utils import normalize_path
 
 _MAX_LINE_CHARS = 500
 
 
 def _search_content(
-    files: List[str],
+    files: Iterable[str],
     compiled: "re.Pattern[str]",
     project_dir: Path,
     context_lines: int,
@@ -116,18 +116,20 @@ def search_files(
     if glob is None and pattern is None:
         raise ValueError("At least one of 'glob' or 'pattern' must be provided")
 
-    all_files = list_files(".", project_dir=project_dir, use_gitignore=True)
+    # Stream paths from the walk so content search starts on the first files
+    all_files = iter_files(".", project_dir=project_dir, use_gitignore=True)
 
+    matched: Iterable[str]
     if glob is not None:
         win32 = sys.platform == "win32"
         norm_glob = glob.lower() if win32 else glob
         spec = PathSpec.from_lines("gitwildmatch", [norm_glob])
 
-        def _norm(p: str) -> str:
-            slashed = p.replace("\\", "/")
-            return slashed.lower() if win32 else slashed
-
-        matched = [f for f in all_files if spec.match_file(_norm(f))]
+        # iter_files already yields "/"-separated paths
+        if win32:
+            matched = (f for f in all_files if spec.match_file(f.lower()))
+        else:
+            matched = (f for f in all_files if spec.match_file(f))
     else:
         matched = all_files
 
@@ -158,12 +160,13 @@ def _norm(p: str) -> str:
         return result
 
     # File search mode: glob only
-    total = len(matched)
+    matched_files = list(matched)
+    total = len(matched_files)
     truncated = total > max_results
 
     return {
         "mode": "file_search",
-        "files": matched[:max_results],
+        "files": matched_files[:max_results],
         "total_files": total,
         "truncated": truncated,
     }
@@ -25,7 +25,7 @@ def _build_tree(file_paths: List[str], base_path: str) -> _TreeNode:
     """Build tree from flat file paths.
 
     Args:
-        file_paths: List of project-relative file paths.
+        file_paths: List of project-relative, ``/``-separated file paths.
         base_path: Path prefix to strip from each path for tree building.
 
     Returns:
@@ -37,8 +37,6 @@ def _build_tree(file_paths: List[str], base_path: str) -> _TreeNode:
         strip_prefix = base_path.rstrip("/") + "/"
 
     for file_path in file_paths:
-        # Normalize separators so split("/") works on Windows
-        file_path = file_path.replace("\\", "/")
         # Strip base_path prefix for tree building
         rel_path = file_path
         if strip_prefix and file_path.startswith(strip_prefix):
@@ -176,7 +174,8 @@ def list_directory_tree(
     listing exceeds 250 lines, then truncates if still too long.
 
     Args:
-        file_paths: List of project-relative file paths.
+        file_paths: List of project-relative file paths, "/"-separated as
+            returned by list_files.
         base_path: Base path for scoping (stripped internally, re-added in output).
         dirs_only: If True, only return directory entries.
 
@@ -186,6 +185,8 @@ def list_directory_tree(
     if not file_paths:
         return []
 
+    # Normalize the base path once instead of every file path
+    base_path = base_path.replace("\\", "/")
     tree = _build_tree(file_paths, base_path)
     _collapse(tree, dirs_only)
     render_prefix = ""
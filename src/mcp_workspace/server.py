@@ -1,9 +1,10 @@
 import asyncio
 import logging
 import re
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from mcp.server.fastmcp import FastMCP
 from mcp_coder_utils.log_utils import log_function_call
@@ -57,10 +58,26 @@
 # Store the project directory as a module-level variable
 _project_dir: Optional[Path] = None
 
-# Per-file locks for concurrent edit safety
+# Per-file locks serializing the tools that change a file
 _file_locks: dict[str, asyncio.Lock] = {}
 
 
+@asynccontextmanager
+async def _hold_file_locks(*file_paths: str) -> AsyncIterator[None]:
+    """Hold the per-file locks of the given paths for the duration of a change.
+
+    Locks are keyed on the resolved path and taken in sorted order, so tools
+    locking several files cannot deadlock each other.
+    """
+    if _project_dir is None:
+        raise ValueError("Project directory has not been set")
+    keys = sorted({str((_project_dir / path).resolve()) for path in file_paths})
+    async with AsyncExitStack() as stack:
+        for key in keys:
+            await stack.enter_async_context(_file_locks.setdefault(key, asyncio.Lock()))
+        yield
+
+
 def _check_not_gitignored(file_path: str) -> None:
     """Raise ValueError if path is excluded by .gitignore.
 
@@ -180,7 +197,7 @@ def list_directory(path: str = ".", dirs_only: bool = False) -> List[str]:
 
 @mcp.tool()
 @log_function_call
-def read_file(
+async def read_file(
     file_path: str,
     start_line: Optional[int] = None,
     end_line: Optional[int] = None,
@@ -209,7 +226,9 @@ def read_file(
 
     logger.info("Reading file: %s", file_path)
     try:
-        content = read_file_util(
+        # Run the blocking read off the event loop so concurrent reads overlap
+        content = await asyncio.to_thread(
+            read_file_util,
             file_path,
             project_dir=_project_dir,
             start_line=start_line,
@@ -224,7 +243,7 @@ def read_file(
 
 @mcp.tool()
 @log_function_call
-def save_file(file_path: str, content: str) -> bool:
+async def save_file(file_path: str, content: str) -> bool:
     """Write content to a file.
 
     Args:
@@ -252,7 +271,12 @@ def save_file(file_path: str, content: str) -> bool:
 
     logger.info("Writing to file: %s", file_path)
     try:
-        success = save_file_util(file_path, content, project_dir=_project_dir)
+        # The write runs off the event loop under the file's lock, so it
+        # cannot interleave with an edit, append or delete of the same file
+        async with _hold_file_locks(file_path):
+            success = await asyncio.to_thread(
+                save_file_util, file_path, content, project_dir=_project_dir
+            )
         return success
     except Exception as e:
         logger.error("Error writing to file: %s", str(e))
@@ -261,7 +285,7 @@ def save_file(file_path: str, content: str) -> bool:
 
 @mcp.tool()
 @log_function_call
-def append_file(file_path: str, content: str) -> bool:
+async def append_file(file_path: str, content: str) -> bool:
     """Append content to the end of a file.
 
     Args:
@@ -289,7 +313,10 @@ def append_file(file_path: str, content: str) -> bool:
 
     logger.info("Appending to file: %s", file_path)
     try:
-        success = append_file_util(file_path, content, project_dir=_project_dir)
+        async with _hold_file_locks(file_path):
+            success = await asyncio.to_thread(
+                append_file_util, file_path, content, project_dir=_project_dir
+            )
         return success
     except Exception as e:
         logger.error("Error appending to file: %s", str(e))
@@ -298,7 +325,7 @@ def append_file(file_path: str, content: str) -> bool:
 
 @mcp.tool()
 @log_function_call
-def delete_this_file(file_path: str) -> bool:
+async def delete_this_file(file_path: str) -> bool:
     """Delete a specified file from the filesystem.
 
     Args:
@@ -320,8 +347,13 @@ def delete_this_file(file_path: str) -> bool:
 
     logger.info("Deleting file: %s", file_path)
     try:
-        # Directly delete the file without user confirmation
-        success = delete_file_util(file_path, project_dir=_project_dir)
+        # Directly delete the file without user confirmation; the file's lock
+        # keeps it from racing other changes to the same file, and the unlink
+        # runs off the event loop so other tool calls proceed meanwhile
+        async with _hold_file_locks(file_path):
+            success = await asyncio.to_thread(
+                delete_file_util, file_path, project_dir=_project_dir
+            )
         logger.info("File deleted successfully: %s", file_path)
         return success
     except Exception as e:
@@ -331,7 +363,7 @@ def delete_this_file(file_path: str) -> bool:
 
 @mcp.tool()
 @log_function_call
-def move_file(source_path: str, destination_path: str) -> bool:
+async def move_file(source_path: str, destination_path: str) -> bool:
     """Move or rename a file or directory within the project.
 
     Args:
@@ -360,8 +392,13 @@ def move_file(source_path: str, destination_path: str) -> bool:
     _check_not_gitignored(destination_path)
 
     try:
-        # Call the underlying function (all logic is handled internally)
-        result = move_file_util(source_path, destination_path, project_dir=_project_dir)
+        # Call the underlying function (all logic is handled internally); it
+        # stays on the event loop so that moves, which may run git mv, never
+        # contend for the git index with each other
+        async with _hold_file_locks(source_path, destination_path):
+            result = move_file_util(
+                source_path, destination_path, project_dir=_project_dir
+            )
 
         # Return simple boolean
         return bool(result.get("success", False))
@@ -392,6 +429,7 @@ async def edit_file(
     old_string: str,
     new_string: str,
     replace_all: bool = False,
+    return_diff: bool = True,
 ) -> str:
     """Make a selective edit to a file using exact string matching.
 
@@ -405,10 +443,12 @@ async def edit_file(
         old_string: Exact text to find and replace
         new_string: Replacement text
         replace_all: Replace all occurrences instead of requiring unique match
+        return_diff: Return the diff of the change; set to False to skip
+            building it on large files and get "Edit applied" instead
 
     Returns:
-        Git-style unified diff showing the changes, or a message
-        if the edit was already applied.
+        Git-style unified diff showing the changes ("Edit applied" if
+        return_diff is False), or a message if the edit was already applied.
     """
     if not file_path or not isinstance(file_path, str):
         raise ValueError(f"File path must be a non-empty string, got {type(file_path)}")
@@ -418,11 +458,16 @@ async def edit_file(
 
     _check_not_gitignored(file_path)
 
-    abs_path = str((_project_dir / file_path).resolve())
-    lock = _file_locks.setdefault(abs_path, asyncio.Lock())
-    async with lock:
-        return edit_file_util(
-            file_path, old_string, new_string, replace_all, _project_dir
+    async with _hold_file_locks(file_path):
+        # Run the blocking read/write off the event loop
+        return await asyncio.to_thread(
+            edit_file_util,
+            file_path,
+            old_string,
+            new_string,
+            replace_all,
+            _project_dir,
+            return_diff,
         )
 
 
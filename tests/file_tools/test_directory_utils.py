@@ -6,14 +6,15 @@
 from unittest.mock import patch
 
 import pytest
+from pathspec import GitIgnoreSpec
 
 # Import functions directly from the module
 from mcp_workspace.file_tools.directory_utils import (
     _discover_files,
-    apply_gitignore_filter,
-    filter_with_gitignore,
+    clear_gitignore_cache,
     is_path_gitignored,
     is_path_in_git_dir,
+    iter_files,
     list_files,
     read_gitignore_rules,
 )
@@ -73,9 +74,9 @@ def test_git_directory_exclusion(project_dir: Path) -> None:
     # Convert to a set of paths for easier assertion
     discovered_paths = set(discovered_files)
 
-    # Convert paths to a format that's consistent across platforms
-    regular_path = str(Path("testdata/test_file_tools/regular.txt"))
-    git_path = str(Path("testdata/test_file_tools/.git/git_config.txt"))
+    # Discovered paths always use forward slashes
+    regular_path = "testdata/test_file_tools/regular.txt"
+    git_path = "testdata/test_file_tools/.git/git_config.txt"
 
     # Assert that the regular file is included
     assert regular_path in discovered_paths
@@ -84,6 +85,78 @@ def test_git_directory_exclusion(project_dir: Path) -> None:
     assert git_path not in discovered_paths
 
 
+def test_version_control_directories_excluded(project_dir: Path) -> None:
+    """Mercurial and Subversion metadata is skipped like .git, without gitignore."""
+    test_dir = project_dir / TEST_DIR
+    for vcs_dir in (".hg", ".svn"):
+        (test_dir / vcs_dir).mkdir(exist_ok=True)
+        (test_dir / vcs_dir / "store.txt").write_text("metadata")
+    (test_dir / "regular.txt").write_text("Regular file content")
+
+    discovered_files = _discover_files(test_dir, project_dir)
+
+    assert "testdata/test_file_tools/regular.txt" in discovered_files
+    assert not any("/.hg/" in f or "/.svn/" in f for f in discovered_files)
+
+
+def test_discover_files_prunes_ignored_directories(project_dir: Path) -> None:
+    """Directories rejected by the matcher are not descended into."""
+    test_dir = project_dir / TEST_DIR
+    (test_dir / "node_modules" / "pkg").mkdir(parents=True)
+    (test_dir / "node_modules" / "pkg" / "index.js").write_text("ignored")
+    (test_dir / "kept.txt").write_text("kept")
+    (test_dir / ".gitignore").write_text("node_modules/\n")
+
+    visited: list[str] = []
+
+    def matcher(path: str) -> bool:
+        visited.append(path)
+        return Path(path).name == "node_modules"
+
+    with patch(
+        "mcp_workspace.file_tools.directory_utils._make_gitignore_matcher",
+        return_value=matcher,
+    ) as mock_make:
+        discovered = _discover_files(test_dir, project_dir, use_gitignore=True)
+
+    # The .gitignore was located from the directory listing
+    (specs,) = mock_make.call_args.args
+    assert [prefix for prefix, _ in specs] == [os.path.join(str(test_dir), "")]
+    assert "testdata/test_file_tools/kept.txt" in discovered
+    assert not any("node_modules" in f for f in discovered)
+    # The pruned subtree was never walked, so its children were never checked
+    assert not any("pkg" in p for p in visited)
+
+
+def test_discover_files_without_gitignore_file(project_dir: Path) -> None:
+    """No gitignore rules are compiled when no .gitignore applies."""
+    test_dir = project_dir / TEST_DIR
+    (test_dir / "kept.txt").write_text("kept")
+
+    with patch(
+        "mcp_workspace.file_tools.directory_utils.GitIgnoreSpec.from_lines"
+    ) as mock_parser:
+        discovered = _discover_files(test_dir, project_dir, use_gitignore=True)
+
+    mock_parser.assert_not_called()
+    assert "testdata/test_file_tools/kept.txt" in discovered
+
+
+def test_discover_files_skips_gitignore_when_disabled(project_dir: Path) -> None:
+    """With use_gitignore=False the .gitignore is never read."""
+    test_dir = project_dir / TEST_DIR
+    (test_dir / "kept.log").write_text("kept")
+    (test_dir / ".gitignore").write_text("*.log\n")
+
+    with patch(
+        "mcp_workspace.file_tools.directory_utils._read_gitignore_entry"
+    ) as mock_read:
+        discovered = list_files(str(TEST_DIR), project_dir, use_gitignore=False)
+
+    mock_read.assert_not_called()
+    assert "testdata/test_file_tools/kept.log" in discovered
+
+
 @pytest.mark.parametrize(
     "path, expected",
     [
@@ -186,52 +259,47 @@ def test_read_gitignore_rules_with_file() -> None:
         assert matcher(not_ignored_file) is False
 
 
-def test_apply_gitignore_filter(project_dir: Path) -> None:
-    """Test applying gitignore filter with a predefined matcher."""
-
-    # Create a simple matcher function that ignores files with .log extension
-    def mock_matcher(path: str) -> bool:
-        return path.endswith(".log")
-
-    # Create list of test file paths
-    file_paths = [
-        "folder/file.txt",
-        "folder/data.log",
-        "another/document.md",
-        "logs/error.log",
-    ]
-
-    # Apply the filter
-    filtered = apply_gitignore_filter(file_paths, mock_matcher, project_dir)
-
-    # Check that only non-.log files remain
-    assert filtered == ["folder/file.txt", "another/document.md"]
-
-    # Test with None matcher
-    assert apply_gitignore_filter(file_paths, None, project_dir) == file_paths
-
-
-def test_filter_with_gitignore_no_gitignore(project_dir: Path) -> None:
-    """Test filtering files when no .gitignore file exists."""
-    # Create a list of file paths
-    file_paths = [
-        "testdata/test_file_tools/file1.txt",
-        "testdata/test_file_tools/file2.txt",
-    ]
-
-    # Test with a directory that doesn't have a .gitignore file
-    test_dir = project_dir / TEST_DIR
+def test_read_gitignore_rules_cached_until_file_changes() -> None:
+    """The parsed matcher is reused until the .gitignore changes on disk."""
+    clear_gitignore_cache()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir) / ".gitignore"
+        temp_path.write_text("*.log\n")
 
-    # Ensure no .gitignore file exists
-    gitignore_path = test_dir / ".gitignore"
-    if gitignore_path.exists():
-        gitignore_path.unlink()
+        with patch(
+            "mcp_workspace.file_tools.directory_utils.GitIgnoreSpec.from_lines",
+            wraps=GitIgnoreSpec.from_lines,
+        ) as mock_parser:
+            first, _ = read_gitignore_rules(temp_path)
+            second, _ = read_gitignore_rules(temp_path)
+            assert first is second
+            assert mock_parser.call_count == 1
+
+            # A changed file (different size) is parsed again
+            temp_path.write_text("*.log\n*.tmp\n")
+            third, content = read_gitignore_rules(temp_path)
+            assert third is not first
+            assert content == "*.log\n*.tmp\n"
+            assert mock_parser.call_count == 2
+            assert third is not None
+            assert third(os.path.join(temp_dir, "scratch.tmp")) is True
+
+
+def test_read_gitignore_rules_without_patterns() -> None:
+    """A .gitignore with only comments and blank lines yields no matcher."""
+    clear_gitignore_cache()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir) / ".gitignore"
+        temp_path.write_text("# nothing ignored yet\n\n   \n")
 
-    # Test the filter with no .gitignore
-    filtered_files = filter_with_gitignore(file_paths, test_dir, project_dir)
+        with patch(
+            "mcp_workspace.file_tools.directory_utils.GitIgnoreSpec.from_lines"
+        ) as mock_parser:
+            matcher, content = read_gitignore_rules(temp_path)
 
-    # Without a .gitignore file, all files should be returned
-    assert set(filtered_files) == set(file_paths)
+        assert matcher is None
+        assert content == "# nothing ignored yet\n\n   \n"
+        mock_parser.assert_not_called()
 
 
 def test_list_files_basic(project_dir: Path) -> None:
@@ -256,23 +324,18 @@ def test_list_files_basic(project_dir: Path) -> None:
             "testdata/test_file_tools/test2.txt",
         ]
 
-        # When gitignore filtering is active, avoid calling the real filter
-        with patch(
-            "mcp_workspace.file_tools.directory_utils.filter_with_gitignore",
-            side_effect=lambda files, *args, **_kwargs: files,
-        ):
-            # Test listing files
-            files = list_files(str(TEST_DIR), project_dir=project_dir)
+        # Test listing files
+        files = list_files(str(TEST_DIR), project_dir=project_dir)
 
-            # Check if all expected files are in the list
-            expected_files = {
-                "testdata/test_file_tools/test1.txt",
-                "testdata/test_file_tools/test2.txt",
-            }
-            actual_files = set(files)
+        # Check if all expected files are in the list
+        expected_files = {
+            "testdata/test_file_tools/test1.txt",
+            "testdata/test_file_tools/test2.txt",
+        }
+        actual_files = set(files)
 
-            # The files should match exactly
-            assert actual_files == expected_files
+        # The files should match exactly
+        assert actual_files == expected_files
 
 
 def test_list_files_with_gitignore(project_dir: Path) -> None:
@@ -288,30 +351,31 @@ def test_list_files_with_gitignore(project_dir: Path) -> None:
     gitignore_path = test_dir / ".gitignore"
     gitignore_path.write_text("*.log")
 
-    # Mock the discovery and filtering
-    with patch(
-        "mcp_workspace.file_tools.directory_utils._discover_files"
-    ) as mock_discover:
-        # Configure the mock to return our test files
-        mock_discover.return_value = [
-            "testdata/test_file_tools/keep.txt",
-            "testdata/test_file_tools/ignore.log",
-        ]
+    # Test listing files with gitignore filtering applied during the walk
+    files = list_files(str(TEST_DIR), project_dir=project_dir, use_gitignore=True)
 
-        # Mock the filter to remove .log files
-        with patch(
-            "mcp_workspace.file_tools.directory_utils.filter_with_gitignore"
-        ) as mock_filter:
-            mock_filter.return_value = ["testdata/test_file_tools/keep.txt"]
+    # The .log file should be filtered out
+    assert "testdata/test_file_tools/keep.txt" in files
+    assert not any(f.endswith("ignore.log") for f in files)
+
+
+def test_list_files_with_gitignore_directory_pattern(project_dir: Path) -> None:
+    """Directory-only patterns exclude directories but not same-named files."""
+    test_dir = project_dir / TEST_DIR
+    (test_dir / "src" / "build").mkdir(parents=True)
+    (test_dir / "src" / "build" / "out.o").write_text("ignored")
+    (test_dir / "docs").mkdir()
+    (test_dir / "docs" / "build").write_text("a file, not a directory")
+    (test_dir / "debug.log").write_text("ignored")
+    (test_dir / "keep.log").write_text("re-included")
+    (test_dir / ".gitignore").write_text("build/\n*.log\n!keep.log\n")
 
-            # Test listing files with gitignore filtering
-            files = list_files(
-                str(TEST_DIR), project_dir=project_dir, use_gitignore=True
-            )
+    files = list_files(str(TEST_DIR), project_dir=project_dir, use_gitignore=True)
 
-            # The .log file should be filtered out
-            assert files == ["testdata/test_file_tools/keep.txt"]
-            assert not any(f.endswith("ignore.log") for f in files)
+    assert "testdata/test_file_tools/docs/build" in files
+    assert "testdata/test_file_tools/keep.log" in files
+    assert not any("src/build" in f for f in files)
+    assert "testdata/test_file_tools/debug.log" not in files
 
 
 def test_list_files_without_gitignore(project_dir: Path) -> None:
@@ -386,3 +450,51 @@ def test_list_files_with_exception(project_dir: Path) -> None:
 
         # Verify that the exception is propagated
         assert "Test error" in str(excinfo.value)
+
+
+def test_list_files_subdirectory_applies_outer_gitignores(project_dir: Path) -> None:
+    """Listing a subdirectory honors .gitignore files above it, deepest last."""
+    test_dir = project_dir / TEST_DIR
+    sub = test_dir / "sub"
+    sub.mkdir()
+    (project_dir / ".gitignore").write_text("*.log\n*.tmp\n")
+    (test_dir / ".gitignore").write_text("generated/\n")
+    (sub / ".gitignore").write_text("!keep.log\n")
+    (sub / "generated").mkdir()
+    (sub / "generated" / "out.txt").write_text("ignored by the middle file")
+    (sub / "debug.log").write_text("ignored by the root file")
+    (sub / "scratch.tmp").write_text("ignored by the root file")
+    (sub / "keep.log").write_text("re-included by the local file")
+    (sub / "code.py").write_text("kept")
+
+    files = list_files(str(TEST_DIR / "sub"), project_dir=project_dir)
+
+    assert sorted(files) == [
+        "testdata/test_file_tools/sub/.gitignore",
+        "testdata/test_file_tools/sub/code.py",
+        "testdata/test_file_tools/sub/keep.log",
+    ]
+
+
+def test_iter_files_matches_list_files(project_dir: Path) -> None:
+    """iter_files yields the same gitignore-filtered paths as list_files."""
+    test_dir = project_dir / TEST_DIR
+    (test_dir / "sub").mkdir(exist_ok=True)
+    (test_dir / "keep.txt").write_text("keep")
+    (test_dir / "sub" / "nested.txt").write_text("nested")
+    (test_dir / "ignore.log").write_text("ignored")
+    (test_dir / ".gitignore").write_text("*.log")
+
+    files = iter_files(str(TEST_DIR), project_dir=project_dir)
+
+    assert not isinstance(files, list)
+    streamed = list(files)
+    assert "testdata/test_file_tools/sub/nested.txt" in streamed
+    assert not any(f.endswith("ignore.log") for f in streamed)
+    assert sorted(streamed) == sorted(list_files(str(TEST_DIR), project_dir))
+
+
+def test_iter_files_validates_directory_eagerly(project_dir: Path) -> None:
+    """Invalid directories are rejected when iter_files is called."""
+    with pytest.raises(FileNotFoundError):
+        iter_files("testdata/non_existent_dir", project_dir=project_dir)
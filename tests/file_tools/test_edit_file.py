@@ -1,8 +1,14 @@
+import difflib
+import os
+import stat
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
-from mcp_workspace.file_tools.edit_file import edit_file
+from mcp_workspace.file_tools.edit_file import _create_diff, edit_file
+
+_TWO_FUNCTIONS = "import os\n\n\ndef a():\n    return 1\n\n\ndef b():\n    return 2\n"
 
 
 class TestEditFile(unittest.TestCase):
@@ -57,6 +63,16 @@ def test_file_not_found(self) -> None:
                 new_string="world",
             )
 
+    def test_directory_is_not_a_file(self) -> None:
+        """Raises ValueError when the path is a directory."""
+        with self.assertRaises(ValueError) as ctx:
+            edit_file(
+                str(self.project_dir),
+                old_string="hello",
+                new_string="world",
+            )
+        self.assertIn("not a file", str(ctx.exception).lower())
+
     def test_text_not_found(self) -> None:
         """Raises ValueError when old_string not in file."""
         with self.assertRaises(ValueError) as ctx:
@@ -141,6 +157,82 @@ def test_multiple_matches_without_replace_all(self) -> None:
                 new_string="xxx",
             )
         self.assertIn("multiple", str(ctx.exception).lower())
+        self.assertIn("(3)", str(ctx.exception))
+
+    def test_overlapping_occurrences_count_as_single_match(self) -> None:
+        """Overlapping occurrences are one match, as with str.count."""
+        with open(self.test_file, "w", encoding="utf-8") as f:
+            f.write("x = 'aaa'\n")
+
+        edit_file(str(self.test_file), old_string="aa", new_string="b")
+
+        with open(self.test_file, "r", encoding="utf-8") as f:
+            content = f.read()
+        self.assertEqual(content, "x = 'ba'\n")
+
+    def test_return_diff_false_skips_diff(self) -> None:
+        """With return_diff=False the edit is applied without building a diff."""
+        with patch(
+            "mcp_workspace.file_tools.edit_file._create_diff"
+        ) as mock_create_diff:
+            result = edit_file(
+                str(self.test_file),
+                old_string="test_function",
+                new_string="modified_function",
+                return_diff=False,
+            )
+
+        self.assertEqual(result, "Edit applied")
+        mock_create_diff.assert_not_called()
+        with open(self.test_file, "r", encoding="utf-8") as f:
+            content = f.read()
+        self.assertEqual(content, "def modified_function():\n    return 'test'\n")
+
+    @unittest.skipIf(os.name == "nt", "POSIX permission bits")
+    def test_edit_keeps_file_mode(self) -> None:
+        """The atomic rewrite keeps the edited file's permission bits."""
+        os.chmod(self.test_file, 0o755)
+
+        edit_file(
+            str(self.test_file),
+            old_string="test_function",
+            new_string="modified_function",
+        )
+
+        self.assertEqual(stat.S_IMODE(os.stat(self.test_file).st_mode), 0o755)
+        self.assertEqual(
+            sorted(p.name for p in self.project_dir.iterdir()), ["test_file.py"]
+        )
+
+    @unittest.skipIf(os.name == "nt", "Symlinks need extra privileges on Windows")
+    def test_edit_through_symlink_changes_target(self) -> None:
+        """Editing a symlink rewrites the file it points at and keeps the link."""
+        link = self.project_dir / "link.py"
+        link.symlink_to(self.test_file.name)
+
+        edit_file(
+            "link.py",
+            old_string="test_function",
+            new_string="modified_function",
+            project_dir=self.project_dir,
+        )
+
+        self.assertTrue(link.is_symlink())
+        self.assertIn("modified_function", self.test_file.read_text(encoding="utf-8"))
+
+    def test_edit_keeps_hard_links(self) -> None:
+        """Editing a hard-linked file changes the content seen by every link."""
+        link = self.project_dir / "link.py"
+        os.link(self.test_file, link)
+
+        edit_file(
+            str(self.test_file),
+            old_string="test_function",
+            new_string="modified_function",
+        )
+
+        self.assertTrue(os.path.samefile(self.test_file, link))
+        self.assertIn("modified_function", link.read_text(encoding="utf-8"))
 
     def test_large_block_replacement(self) -> None:
         """Multi-line edit works correctly."""
@@ -247,6 +339,119 @@ def test_diff_headers_have_newlines(self) -> None:
         self.assertIn("\n+++ ", result)
         self.assertIn("\n@@ ", result)
 
+    def _difflib_diff(self, original: str, modified: str, filename: str) -> str:
+        """Diff of the untrimmed content, as difflib produces it."""
+        return "".join(
+            difflib.unified_diff(
+                original.splitlines(keepends=True),
+                modified.splitlines(keepends=True),
+                fromfile=f"a/{filename}",
+                tofile=f"b/{filename}",
+                n=3,
+            )
+        )
+
+    def test_diff_hunks_use_full_file_line_numbers(self) -> None:
+        """Hunks deep in a file report line numbers of the whole file."""
+        lines = []
+        for i in range(1, 201):
+            lines.append(f"line {i}\n")
+            if i % 10 == 0:
+                lines.append("\n")
+        original = "".join(lines)
+        modified = original.replace("line 100\n", "line one hundred\n")
+        modified = modified.replace("line 150\n", "")
+        # An insertion next to a blank line, at the end of the changed lines
+        modified = modified.replace("line 170\n\n", "line 170\n\nline 170.5\n\n")
+
+        result = _create_diff(original, modified, "big.txt")
+
+        self.assertEqual(result, self._difflib_diff(original, modified, "big.txt"))
+        self.assertIn("@@ -106,7 +106,7 @@", result)
+        self.assertIn("@@ -161,7 +161,6 @@", result)
+        self.assertIn("@@ -185,6 +184,8 @@", result)
+
+    def test_diff_next_to_repeated_lines_matches_difflib(self) -> None:
+        """Edits beside blank or duplicate lines diff like the untrimmed content."""
+        cases = [
+            (
+                _TWO_FUNCTIONS,
+                _TWO_FUNCTIONS.replace("def b", "def c():\n    return 3\n\n\ndef b"),
+            ),
+            (_TWO_FUNCTIONS, _TWO_FUNCTIONS.replace("\n\ndef b", "\n\n\n\ndef b")),
+            (
+                _TWO_FUNCTIONS,
+                _TWO_FUNCTIONS.replace("    return 1\n\n", "    return 1\n"),
+            ),
+            ("a\nb\na\nb\nc\n", "a\nb\na\nb\na\nb\nc\n"),
+            ("x\n" * 5 + "y\n" + "x\n" * 5, "x\n" * 6 + "y\n" + "x\n" * 5),
+        ]
+        for original, modified in cases:
+            with self.subTest(modified=modified):
+                result = _create_diff(original, modified, "f.txt")
+
+                self.assertEqual(
+                    result, self._difflib_diff(original, modified, "f.txt")
+                )
+
+    def test_diff_of_changed_span_matches_difflib(self) -> None:
+        """Diffing only around the replaced span gives the untrimmed diff."""
+        original = "".join(f"line {i}\n" for i in range(1, 51))
+        original += "\n" * 10 + "tail\n"
+        cases = [
+            (original, "line 25\n", "line twenty-five\n"),
+            (original, "line 1\n", ""),
+            (original, "tail\n", "tail\nmore\n"),
+            # Deleting one of many blank lines is ambiguous to trim
+            (original, "line 50\n\n", "line 50\n"),
+            (original, "line 50\n\n", "line 50\n\nline 51\n\n"),
+            (_TWO_FUNCTIONS, "def b", "def c():\n    return 3\n\n\ndef b"),
+            (_TWO_FUNCTIONS, "\n\ndef b", "\n\n\n\ndef b"),
+        ]
+        for text, old, new in cases:
+            with self.subTest(old=old, new=new):
+                pos = text.find(old)
+                end = pos + len(old)
+                modified = text[:pos] + new + text[end:]
+
+                result = _create_diff(
+                    text, modified, "f.txt", (pos, end, pos + len(new))
+                )
+
+                self.assertEqual(result, self._difflib_diff(text, modified, "f.txt"))
+
+    def test_diff_of_changed_span_with_line_breaks_in_new_text(self) -> None:
+        """Line breaks other than "\\n" in the new text give the untrimmed diff."""
+        # "a" is just frequent enough in the modified text for difflib to skip
+        # it when aligning, which a search for "\\na\\n" would miss
+        lines = [f"line {i}\n" for i in range(10)]
+        lines += ["a\n"] + [f"x{i % 10}\n" for i in range(200)] + ["a\n"] * 3
+        original = "".join(lines)
+        pos = original.find("a\n")
+        for new in ("\x0c", "\r", "b\x0c"):
+            with self.subTest(new=new):
+                modified = original[:pos] + new + original[pos:]
+
+                result = _create_diff(
+                    original, modified, "f.txt", (pos, pos, pos + len(new))
+                )
+
+                self.assertEqual(
+                    result, self._difflib_diff(original, modified, "f.txt")
+                )
+
+    def test_diff_of_changed_span_with_other_line_breaks(self) -> None:
+        """Line breaks other than "\\n" keep the hunk line numbers of the full diff."""
+        original = "# section\x0c\n" + "".join(f"line {i}\n" for i in range(1, 11))
+        pos = original.find("line 8")
+        end = pos + len("line 8")
+        modified = original[:pos] + "line eight" + original[end:]
+
+        result = _create_diff(original, modified, "f.txt", (pos, end, pos + 10))
+
+        self.assertIn("@@ -7,6 +7,6 @@", result)
+        self.assertEqual(result, _create_diff(original, modified, "f.txt"))
+
     def _assert_diff_uses_relative_forward_slash_path(
         self, file_path: str, expected_from: str, expected_to: str
     ) -> None:
@@ -1,12 +1,18 @@
 """Tests for the edit_file MCP server tool (async + locking)."""
 
 import asyncio
+import importlib
+import time
 from pathlib import Path
-from typing import Generator
+from typing import Any, Generator
+from unittest.mock import patch
 
 import pytest
 
-from mcp_workspace.server import edit_file, save_file, set_project_dir
+from mcp_workspace.server import append_file, edit_file, save_file, set_project_dir
+
+# The package re-exports edit_file, which shadows the module attribute
+edit_file_module = importlib.import_module("mcp_workspace.file_tools.edit_file")
 
 # Test constants
 TEST_DIR = Path("testdata/test_file_tools")
@@ -39,7 +45,7 @@ def setup_test_file(project_dir: Path) -> Generator[None, None, None]:
 @pytest.mark.asyncio
 async def test_basic_edit_via_server(project_dir: Path) -> None:
     """Basic edit via server tool returns diff string."""
-    save_file(str(TEST_FILE), TEST_CONTENT)
+    await save_file(str(TEST_FILE), TEST_CONTENT)
 
     result = await edit_file(
         file_path=str(TEST_FILE),
@@ -60,7 +66,7 @@ async def test_basic_edit_via_server(project_dir: Path) -> None:
 @pytest.mark.asyncio
 async def test_text_not_found_raises_value_error(project_dir: Path) -> None:
     """Text not found raises ValueError."""
-    save_file(str(TEST_FILE), TEST_CONTENT)
+    await save_file(str(TEST_FILE), TEST_CONTENT)
 
     with pytest.raises(ValueError, match="Text not found"):
         await edit_file(
@@ -74,7 +80,7 @@ async def test_text_not_found_raises_value_error(project_dir: Path) -> None:
 async def test_replace_all_via_server(project_dir: Path) -> None:
     """replace_all=True replaces all occurrences."""
     repeated_content = "aaa bbb aaa ccc aaa"
-    save_file(str(TEST_FILE), repeated_content)
+    await save_file(str(TEST_FILE), repeated_content)
 
     result = await edit_file(
         file_path=str(TEST_FILE),
@@ -88,10 +94,27 @@ async def test_replace_all_via_server(project_dir: Path) -> None:
     assert content == "zzz bbb zzz ccc zzz"
 
 
+@pytest.mark.asyncio
+async def test_return_diff_false_via_server(project_dir: Path) -> None:
+    """return_diff=False applies the edit without returning a diff."""
+    await save_file(str(TEST_FILE), TEST_CONTENT)
+
+    result = await edit_file(
+        file_path=str(TEST_FILE),
+        old_string="Line 4 to be edited.",
+        new_string="Line 4 has been modified.",
+        return_diff=False,
+    )
+
+    assert result == "Edit applied"
+    content = (project_dir / TEST_FILE).read_text(encoding="utf-8")
+    assert "Line 4 has been modified." in content
+
+
 @pytest.mark.asyncio
 async def test_empty_old_string_inserts_at_beginning(project_dir: Path) -> None:
     """Empty old_string inserts new_string at beginning of file."""
-    save_file(str(TEST_FILE), TEST_CONTENT)
+    await save_file(str(TEST_FILE), TEST_CONTENT)
 
     result = await edit_file(
         file_path=str(TEST_FILE),
@@ -127,7 +150,7 @@ async def test_gitignore_check_rejects_ignored_files(project_dir: Path) -> None:
 async def test_locking_serializes_same_file_edits(project_dir: Path) -> None:
     """Two concurrent async edits to same file both succeed (no lost writes)."""
     lock_file = TEST_DIR / "lock_test_a.txt"
-    save_file(str(lock_file), "line_a\nline_b\n")
+    await save_file(str(lock_file), "line_a\nline_b\n")
 
     async def edit_a() -> None:
         result: str = await edit_file(
@@ -152,13 +175,34 @@ async def edit_b() -> None:
     assert "LINE_B" in content
 
 
+@pytest.mark.asyncio
+async def test_append_waits_for_edit_of_same_file(project_dir: Path) -> None:
+    """An append during an edit of the same file is not lost to the edit's write."""
+    lock_file = TEST_DIR / "lock_test_a.txt"
+    await save_file(str(lock_file), "line_a\n")
+    write_edited_file = edit_file_module._write_edited_file
+
+    def slow_write(*args: Any) -> None:
+        # Widen the gap between the edit's read and its write
+        time.sleep(0.2)
+        write_edited_file(*args)
+
+    with patch.object(edit_file_module, "_write_edited_file", side_effect=slow_write):
+        await asyncio.gather(
+            edit_file(file_path=str(lock_file), old_string="line_a", new_string="A"),
+            append_file(str(lock_file), "tail\n"),
+        )
+
+    assert (project_dir / lock_file).read_text(encoding="utf-8") == "A\ntail\n"
+
+
 @pytest.mark.asyncio
 async def test_different_files_not_blocked(project_dir: Path) -> None:
     """Concurrent edits to different files don't interfere."""
     file_a = TEST_DIR / "lock_test_a.txt"
     file_b = TEST_DIR / "lock_test_b.txt"
-    save_file(str(file_a), "content_a\n")
-    save_file(str(file_b), "content_b\n")
+    await save_file(str(file_a), "content_a\n")
+    await save_file(str(file_b), "content_b\n")
 
     async def edit_a() -> None:
         result: str = await edit_file(
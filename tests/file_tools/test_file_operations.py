@@ -2,7 +2,9 @@
 
 import os
 import shutil
+import stat
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -72,6 +74,47 @@ def test_save_file_atomic_overwrite(project_dir: Path) -> None:
     assert len(temp_files) == 0
 
 
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permission bits")
+def test_save_file_keeps_mode_of_overwritten_file(project_dir: Path) -> None:
+    """Test that overwriting a file keeps its permission bits."""
+    abs_file_path = project_dir / TEST_FILE
+    abs_file_path.write_text("old", encoding="utf-8")
+    os.chmod(abs_file_path, 0o754)
+
+    save_file(str(TEST_FILE), "new", project_dir=project_dir)
+
+    assert stat.S_IMODE(os.stat(abs_file_path).st_mode) == 0o754
+    assert abs_file_path.read_text(encoding="utf-8") == "new"
+
+
+def test_save_file_flushes_before_replace(project_dir: Path) -> None:
+    """Test that the temporary file is flushed before it replaces the target."""
+    with (
+        patch("mcp_workspace.file_tools.file_operations._fdatasync") as mock_fdatasync,
+        patch(
+            "mcp_workspace.file_tools.file_operations.os.replace", wraps=os.replace
+        ) as mock_replace,
+    ):
+        mock_fdatasync.side_effect = lambda fd: mock_replace.assert_not_called()
+        save_file(str(TEST_FILE), TEST_CONTENT, project_dir=project_dir)
+
+    mock_fdatasync.assert_called_once()
+    mock_replace.assert_called_once()
+    assert (project_dir / TEST_FILE).read_text(encoding="utf-8") == TEST_CONTENT
+
+
+def test_save_file_unencodable_content(project_dir: Path) -> None:
+    """Test that unencodable content raises ValueError and leaves no files."""
+    target_dir = (project_dir / TEST_FILE).parent
+    target_dir.mkdir(parents=True, exist_ok=True)
+    before = set(target_dir.iterdir())
+
+    with pytest.raises(ValueError, match="cannot be encoded"):
+        save_file(str(TEST_FILE), "lone surrogate \ud800", project_dir=project_dir)
+
+    assert set(target_dir.iterdir()) == before
+
+
 def test_save_file_security(project_dir: Path) -> None:
     """Test security checks in save_file."""
     # Try to write a file outside the project directory
@@ -223,6 +266,36 @@ def test_append_file(project_dir: Path) -> None:
     assert content == expected_content
 
 
+def test_append_file_leaves_existing_bytes_untouched(project_dir: Path) -> None:
+    """Test that appending writes only the new content after the existing bytes."""
+    abs_file_path = project_dir / TEST_FILE
+    abs_file_path.write_bytes(b"kept\r\nas is\r\n")
+    inode_before = os.stat(abs_file_path).st_ino
+
+    result = append_file(str(TEST_FILE), "tail", project_dir=project_dir)
+
+    assert result is True
+    assert abs_file_path.read_bytes() == b"kept\r\nas is\r\ntail"
+    assert os.stat(abs_file_path).st_ino == inode_before
+
+
+def test_append_file_flushes_before_close(project_dir: Path) -> None:
+    """Test that appended content is flushed before the file is closed."""
+    (project_dir / TEST_FILE).write_text("head", encoding="utf-8")
+    with (
+        patch("mcp_workspace.file_tools.file_operations._fdatasync") as mock_fdatasync,
+        patch(
+            "mcp_workspace.file_tools.file_operations.os.close", wraps=os.close
+        ) as mock_close,
+    ):
+        mock_fdatasync.side_effect = lambda fd: mock_close.assert_not_called()
+        append_file(str(TEST_FILE), "tail", project_dir=project_dir)
+
+    mock_fdatasync.assert_called_once()
+    mock_close.assert_called_once()
+    assert (project_dir / TEST_FILE).read_text(encoding="utf-8") == "headtail"
+
+
 def test_append_file_empty(project_dir: Path) -> None:
     """Test appending to an empty file."""
     # Create the empty file
@@ -461,6 +534,16 @@ def test_read_file_full_read_unchanged(project_dir: Path) -> None:
     assert content == expected
 
 
+def test_read_file_full_read_translates_newlines(project_dir: Path) -> None:
+    """Full read turns CRLF and lone CR into LF, as a text-mode read does."""
+    abs_file_path = project_dir / TEST_FILE
+    abs_file_path.write_bytes(b"a\r\nb\rc\n")
+
+    content = read_file(str(TEST_FILE), project_dir=project_dir)
+
+    assert content == "a\nb\nc\n"
+
+
 def test_read_file_no_trailing_newline(project_dir: Path) -> None:
     """File without trailing newline: slicing last line preserves that."""
     abs_path = project_dir / TEST_FILE
@@ -7,7 +7,8 @@
 from git import Repo
 from git.exc import GitCommandError
 
-from mcp_workspace.file_tools.file_operations import move_file
+from mcp_workspace.file_tools.file_operations import clear_git_project_cache, move_file
+from mcp_workspace.git_operations import is_git_repository
 
 
 class TestGitMoveIntegration:
@@ -158,6 +159,27 @@ def test_move_non_git_repository(self, tmp_path: Path) -> None:
         assert moved_file.exists()
         assert moved_file.read_text() == "normal content"
 
+    def test_git_repository_detected_once(self, tmp_path: Path) -> None:
+        """Test that repeated moves detect the git repository only once."""
+        repo = Repo.init(tmp_path)
+        for name in ("a.txt", "b.txt"):
+            (tmp_path / name).write_text(name)
+            repo.index.add([str(tmp_path / name)])
+        repo.index.commit("Initial commit")
+
+        clear_git_project_cache()
+        with patch(
+            "mcp_workspace.file_tools.file_operations.is_git_repository",
+            wraps=is_git_repository,
+        ) as mock_is_git_repository:
+            first = move_file("a.txt", "a_moved.txt", project_dir=tmp_path)
+            second = move_file("b.txt", "b_moved.txt", project_dir=tmp_path)
+        clear_git_project_cache()
+
+        assert first["method"] == "git"
+        assert second["method"] == "git"
+        mock_is_git_repository.assert_called_once_with(tmp_path)
+
     def test_move_file_with_staged_changes(self, tmp_path: Path) -> None:
         """Test moving a file that has staged changes."""
         # Create a git repository
@@ -7,7 +7,11 @@
 import pytest
 
 # Import functions directly from the module
-from mcp_workspace.file_tools.path_utils import normalize_line_endings, normalize_path
+from mcp_workspace.file_tools.path_utils import (
+    clear_project_dir_cache,
+    normalize_line_endings,
+    normalize_path,
+)
 from tests.conftest import TEST_DIR
 
 
@@ -32,6 +36,12 @@ def test_normalize_line_endings_mixed() -> None:
     assert normalized == "a\nb\nc\n"
 
 
+def test_normalize_line_endings_without_carriage_returns() -> None:
+    """Test that text without carriage returns is returned unchanged."""
+    text = "line1\nline2\n"
+    assert normalize_line_endings(text) is text
+
+
 def test_normalize_path_relative() -> None:
     """Test normalizing a relative path."""
     # Define the project directory for testing
@@ -108,3 +118,18 @@ def test_normalize_path_security_error_relative() -> None:
     # Verify the security error message
     assert "Security error" in str(excinfo.value)
     assert "outside the project directory" in str(excinfo.value)
+
+
+def test_normalize_path_resolves_project_dir_once(tmp_path: Path) -> None:
+    """Test that the project directory is resolved once across calls."""
+    clear_project_dir_cache()
+    real_resolve = Path.resolve
+    with patch.object(
+        Path, "resolve", autospec=True, side_effect=real_resolve
+    ) as mock_resolve:
+        normalize_path("a.txt", tmp_path)
+        normalize_path("b.txt", tmp_path)
+
+    resolved = [call.args[0] for call in mock_resolve.call_args_list]
+    assert resolved.count(tmp_path) == 1
+    clear_project_dir_cache()
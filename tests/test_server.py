@@ -1,7 +1,7 @@
 """Tests for the MCP server API endpoints."""
 
 from pathlib import Path
-from typing import Callable, Generator
+from typing import Awaitable, Callable, Generator
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -47,9 +47,10 @@ def teardown_function() -> None:
         TEST_FILE.unlink()
 
 
-def test_save_file(project_dir: Path) -> None:
+@pytest.mark.asyncio
+async def test_save_file(project_dir: Path) -> None:
     """Test the save_file tool."""
-    result = save_file(str(TEST_FILE), TEST_CONTENT)
+    result = await save_file(str(TEST_FILE), TEST_CONTENT)
 
     # Create absolute path for verification
     abs_file_path = project_dir / TEST_FILE
@@ -62,7 +63,8 @@ def test_save_file(project_dir: Path) -> None:
     assert content == TEST_CONTENT
 
 
-def test_read_file(project_dir: Path) -> None:
+@pytest.mark.asyncio
+async def test_read_file(project_dir: Path) -> None:
     """Test the read_file tool."""
     # Create absolute path for test file
     abs_file_path = project_dir / TEST_FILE
@@ -71,12 +73,13 @@ def test_read_file(project_dir: Path) -> None:
     with open(abs_file_path, "w", encoding="utf-8") as f:
         f.write(TEST_CONTENT)
 
-    content = read_file(str(TEST_FILE))
+    content = await read_file(str(TEST_FILE))
 
     assert content == TEST_CONTENT
 
 
-def test_read_file_not_found() -> None:
+@pytest.mark.asyncio
+async def test_read_file_not_found() -> None:
     """Test the read_file tool with a non-existent file."""
     non_existent_file = TEST_DIR / "non_existent.txt"
 
@@ -85,10 +88,11 @@ def test_read_file_not_found() -> None:
         Path(non_existent_file).unlink()
 
     with pytest.raises(FileNotFoundError):
-        read_file(str(non_existent_file))
+        await read_file(str(non_existent_file))
 
 
-def test_append_file(project_dir: Path) -> None:
+@pytest.mark.asyncio
+async def test_append_file(project_dir: Path) -> None:
     """Test the append_file tool."""
     # Create absolute path for test file
     abs_file_path = project_dir / TEST_FILE
@@ -100,7 +104,7 @@ def test_append_file(project_dir: Path) -> None:
 
     # Append content to the file
     append_content = "Appended content."
-    result = append_file(str(TEST_FILE), append_content)
+    result = await append_file(str(TEST_FILE), append_content)
 
     # Verify the file was updated
     assert result is True
@@ -113,7 +117,8 @@ def test_append_file(project_dir: Path) -> None:
     assert content == expected_content
 
 
-def test_append_file_empty(project_dir: Path) -> None:
+@pytest.mark.asyncio
+async def test_append_file_empty(project_dir: Path) -> None:
     """Test appending to an empty file."""
     # Create the empty file
     empty_file = TEST_DIR / "empty_file.txt"
@@ -123,7 +128,7 @@ def test_append_file_empty(project_dir: Path) -> None:
 
     # Append content to the empty file
     append_content = "Content added to empty file."
-    result = append_file(str(empty_file), append_content)
+    result = await append_file(str(empty_file), append_content)
 
     # Verify the file was updated
     assert result is True
@@ -135,7 +140,8 @@ def test_append_file_empty(project_dir: Path) -> None:
     assert content == append_content
 
 
-def test_append_file_not_found() -> None:
+@pytest.mark.asyncio
+async def test_append_file_not_found() -> None:
     """Test appending to a file that doesn't exist."""
     non_existent_file = TEST_DIR / "non_existent_append.txt"
 
@@ -145,7 +151,7 @@ def test_append_file_not_found() -> None:
 
     # Test appending to a non-existent file
     with pytest.raises(FileNotFoundError):
-        append_file(str(non_existent_file), "This should fail")
+        await append_file(str(non_existent_file), "This should fail")
 
 
 @patch("mcp_workspace.server.list_directory_tree")
@@ -360,7 +366,8 @@ def test_list_directory_path_subtree_integration(project_dir: Path) -> None:
     assert not any("root.py" in entry for entry in result)
 
 
-def test_move_file(project_dir: Path) -> None:
+@pytest.mark.asyncio
+async def test_move_file(project_dir: Path) -> None:
     """Test the move_file tool."""
     # Create source file
     source_file = TEST_DIR / "source.txt"
@@ -378,7 +385,7 @@ def test_move_file(project_dir: Path) -> None:
         abs_dest.unlink()
 
     # Move the file
-    result = move_file(str(source_file), str(dest_file))
+    result = await move_file(str(source_file), str(dest_file))
 
     assert result is True
     assert not abs_source.exists()
@@ -391,11 +398,12 @@ def test_move_file(project_dir: Path) -> None:
         abs_dest.unlink()
 
 
-def test_move_file_simplified_errors(project_dir: Path) -> None:
+@pytest.mark.asyncio
+async def test_move_file_simplified_errors(project_dir: Path) -> None:
     """Test that server endpoint returns simplified error messages."""
     # Test file not found
     with pytest.raises(FileNotFoundError) as exc_info:
-        move_file("nonexistent.txt", "dest.txt")
+        await move_file("nonexistent.txt", "dest.txt")
     assert str(exc_info.value) == "File not found"  # Simple message
 
     # Test destination exists
@@ -412,7 +420,7 @@ def test_move_file_simplified_errors(project_dir: Path) -> None:
         f.write("Existing")
 
     with pytest.raises(FileExistsError) as exc_info2:
-        move_file(str(source_file), str(dest_file))
+        await move_file(str(source_file), str(dest_file))
     assert str(exc_info2.value) == "Destination already exists"  # Simple message
 
     # Clean up
@@ -422,30 +430,37 @@ def test_move_file_simplified_errors(project_dir: Path) -> None:
         abs_dest.unlink()
 
 
+@pytest.mark.asyncio
 @patch("mcp_workspace.server.move_file_util")
-def test_move_file_permission_error(mock_move: MagicMock, project_dir: Path) -> None:
+async def test_move_file_permission_error(
+    mock_move: MagicMock, project_dir: Path
+) -> None:
     """Test permission error handling in move_file."""
     # Mock move_file_util to raise PermissionError
     mock_move.side_effect = PermissionError("Access denied to file: /some/path")
 
     with pytest.raises(PermissionError) as exc:
-        move_file("readonly.txt", "dest.txt")
+        await move_file("readonly.txt", "dest.txt")
     assert str(exc.value) == "Permission denied"  # Simple message
 
 
+@pytest.mark.asyncio
 @patch("mcp_workspace.server.move_file_util")
-def test_move_file_security_error(mock_move: MagicMock, project_dir: Path) -> None:
+async def test_move_file_security_error(
+    mock_move: MagicMock, project_dir: Path
+) -> None:
     """Test security error handling in move_file."""
     # Mock move_file_util to raise ValueError with security message
     mock_move.side_effect = ValueError("Security: Path outside project directory")
 
     with pytest.raises(ValueError) as exc:
-        move_file("../outside.txt", "dest.txt")
+        await move_file("../outside.txt", "dest.txt")
     assert str(exc.value) == "Invalid path"  # Simple message
 
 
+@pytest.mark.asyncio
 @patch("mcp_workspace.server.move_file_util")
-def test_move_file_generic_error(mock_move: MagicMock, project_dir: Path) -> None:
+async def test_move_file_generic_error(mock_move: MagicMock, project_dir: Path) -> None:
     """Test generic error handling in move_file."""
     # Import move_file here to avoid issues if not yet implemented
     from mcp_workspace.server import move_file as move_file_fn
@@ -454,7 +469,7 @@ def test_move_file_generic_error(mock_move: MagicMock, project_dir: Path) -> Non
     mock_move.side_effect = RuntimeError("Some complex internal error")
 
     with pytest.raises(RuntimeError) as exc:
-        move_file_fn("source.txt", "dest.txt")
+        await move_file_fn("source.txt", "dest.txt")
     assert str(exc.value) == "Move operation failed"  # Simple message
 
 
@@ -468,17 +483,19 @@ def gitignore_project(project_dir: Path) -> Path:
     return project_dir
 
 
-def test_read_file_gitignored(gitignore_project: Path) -> None:
+@pytest.mark.asyncio
+async def test_read_file_gitignored(gitignore_project: Path) -> None:
     """read_file on gitignored file raises ValueError."""
     (gitignore_project / "debug.log").write_text("log content")
     with pytest.raises(ValueError, match="excluded by .gitignore"):
-        read_file("debug.log")
+        await read_file("debug.log")
 
 
-def test_save_file_gitignored(gitignore_project: Path) -> None:
+@pytest.mark.asyncio
+async def test_save_file_gitignored(gitignore_project: Path) -> None:
     """save_file to gitignored path raises ValueError."""
     with pytest.raises(ValueError, match="excluded by .gitignore"):
-        save_file("output.log", "content")
+        await save_file("output.log", "content")
 
 
 @pytest.mark.asyncio
@@ -488,86 +505,109 @@ async def test_edit_file_gitignored(gitignore_project: Path) -> None:
         await edit_file("debug.log", old_string="a", new_string="b")
 
 
-def test_append_file_gitignored(gitignore_project: Path) -> None:
+@pytest.mark.asyncio
+async def test_append_file_gitignored(gitignore_project: Path) -> None:
     """append_file to gitignored file raises ValueError."""
     (gitignore_project / "debug.log").write_text("existing")
     with pytest.raises(ValueError, match="excluded by .gitignore"):
-        append_file("debug.log", "more")
+        await append_file("debug.log", "more")
 
 
-def test_delete_file_gitignored(gitignore_project: Path) -> None:
+@pytest.mark.asyncio
+async def test_delete_file_gitignored(gitignore_project: Path) -> None:
     """delete_this_file on gitignored file raises ValueError."""
     (gitignore_project / "debug.log").write_text("to delete")
     with pytest.raises(ValueError, match="excluded by .gitignore"):
-        delete_this_file("debug.log")
+        await delete_this_file("debug.log")
 
 
-def test_move_file_gitignored_source(gitignore_project: Path) -> None:
+@pytest.mark.asyncio
+async def test_delete_this_file(project_dir: Path) -> None:
+    """delete_this_file removes the file and reports success."""
+    target = project_dir / "to_delete.txt"
+    target.write_text("bye")
+
+    result = await delete_this_file("to_delete.txt")
+
+    assert result is True
+    assert not target.exists()
+
+
+@pytest.mark.asyncio
+async def test_move_file_gitignored_source(gitignore_project: Path) -> None:
     """move_file with gitignored source raises ValueError."""
     (gitignore_project / "debug.log").write_text("content")
     with pytest.raises(ValueError, match="excluded by .gitignore"):
-        move_file("debug.log", "renamed.txt")
+        await move_file("debug.log", "renamed.txt")
 
 
-def test_move_file_gitignored_destination(gitignore_project: Path) -> None:
+@pytest.mark.asyncio
+async def test_move_file_gitignored_destination(gitignore_project: Path) -> None:
     """move_file with gitignored destination raises ValueError."""
     (gitignore_project / "safe.txt").write_text("content")
     with pytest.raises(ValueError, match="excluded by .gitignore"):
-        move_file("safe.txt", "output.log")
+        await move_file("safe.txt", "output.log")
 
 
-def test_read_file_in_gitignored_directory(gitignore_project: Path) -> None:
+@pytest.mark.asyncio
+async def test_read_file_in_gitignored_directory(gitignore_project: Path) -> None:
     """File inside gitignored directory (__pycache__/) is blocked."""
     cache_dir = gitignore_project / "__pycache__"
     cache_dir.mkdir()
     (cache_dir / "module.pyc").write_text("bytecode")
     with pytest.raises(ValueError, match="excluded by .gitignore"):
-        read_file("__pycache__/module.pyc")
+        await read_file("__pycache__/module.pyc")
 
 
-def test_read_file_git_config(gitignore_project: Path) -> None:
+@pytest.mark.asyncio
+async def test_read_file_git_config(gitignore_project: Path) -> None:
     """read_file on .git/config is blocked."""
     git_dir = gitignore_project / ".git"
     git_dir.mkdir()
     (git_dir / "config").write_text("[core]")
     with pytest.raises(ValueError, match="excluded by .gitignore"):
-        read_file(".git/config")
+        await read_file(".git/config")
 
 
-def test_save_file_git_hooks(gitignore_project: Path) -> None:
+@pytest.mark.asyncio
+async def test_save_file_git_hooks(gitignore_project: Path) -> None:
     """save_file to .git/hooks/ is blocked."""
     with pytest.raises(ValueError, match="excluded by .gitignore"):
-        save_file(".git/hooks/pre-commit", "#!/bin/sh")
+        await save_file(".git/hooks/pre-commit", "#!/bin/sh")
 
 
-def test_read_file_not_gitignored(gitignore_project: Path) -> None:
+@pytest.mark.asyncio
+async def test_read_file_not_gitignored(gitignore_project: Path) -> None:
     """Non-gitignored file works normally."""
     (gitignore_project / "readme.txt").write_text("hello")
-    content = read_file("readme.txt")
+    content = await read_file("readme.txt")
     assert content == "hello"
 
 
-def test_save_file_not_gitignored(gitignore_project: Path) -> None:
+@pytest.mark.asyncio
+async def test_save_file_not_gitignored(gitignore_project: Path) -> None:
     """Non-gitignored save works normally."""
-    result = save_file("readme.txt", "hello")
+    result = await save_file("readme.txt", "hello")
     assert result is True
 
 
-def test_read_file_no_gitignore(project_dir: Path) -> None:
+@pytest.mark.asyncio
+async def test_read_file_no_gitignore(project_dir: Path) -> None:
     """Without .gitignore, all files are accessible."""
     (project_dir / "debug.log").write_text("log content")
-    content = read_file("debug.log")
+    content = await read_file("debug.log")
     assert content == "log content"
 
 
+@pytest.mark.asyncio
 @patch("mcp_workspace.server.read_file_util")
-def test_read_file_forwards_line_range_params(
+async def test_read_file_forwards_line_range_params(
     mock_read_file_util: MagicMock, project_dir: Path
 ) -> None:
     """Test that read_file forwards line-range params to read_file_util."""
     mock_read_file_util.return_value = "5\u2192line five\n6\u2192line six\n"
 
-    result = read_file(
+    result = await read_file(
         "some_file.py",
         start_line=5,
         end_line=10,
@@ -587,9 +627,10 @@ def test_read_file_forwards_line_range_params(
 # --- Content type rejection tests ---
 
 
+@pytest.mark.asyncio
 @pytest.mark.parametrize("func", [save_file, append_file])
-def test_rejects_non_string_content(
-    func: Callable[..., bool], project_dir: Path
+async def test_rejects_non_string_content(
+    func: Callable[..., Awaitable[bool]], project_dir: Path
 ) -> None:
     """save_file and append_file reject non-string content with ValueError."""
     # Create a file for append_file to target
@@ -598,7 +639,7 @@ def test_rejects_non_string_content(
     target.write_text("existing")
 
     with pytest.raises(ValueError, match="Content must be a string"):
-        func(str(TEST_DIR / "type_test.txt"), {"key": "value"})
+        await func(str(TEST_DIR / "type_test.txt"), {"key": "value"})
 
 
 # --- Git read-only operation tool tests ---
@@ -36,6 +36,11 @@
 _.search_reference_files
 _.clear_clone_failure_cache
 
+# Test helpers for module-level caches in file_tools
+_.clear_gitignore_cache
+_.clear_project_dir_cache
+_.clear_git_project_cache
+
 # Git read-only operation tool registered in server.py
 _.git
 